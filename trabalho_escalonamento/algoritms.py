@@ -1,6 +1,10 @@
-from abc import ABC
+from abc import ABC, abstractmethod
 from models import Tarefa_Finalizada
-from diagrama_Gantt import grafico_tarefas_escalonadas
+from ready_queue import ESCALA_VRUNTIME, PESO_BASE, peso_da_prioridade
+from diagrama_Gantt import iniciar_renderizacao
+import logging
+
+logger = logging.getLogger(__name__)
 
 class BaseAlgorithm(ABC):
     '''
@@ -14,7 +18,27 @@ class BaseAlgorithm(ABC):
         self.tarefa_em_execucao = False
         self.old_clock = None
         self.tarefa_no_momento = None
-        self.tarefas_concluidas = []
+
+        # Decisões de escalonamento (threads retiradas da fila de prontos para
+        # a CPU) e trocas de contexto: vezes em que a CPU passou a executar
+        # uma thread diferente da última que executou
+        self.escalonamentos = 0
+        self.trocas_de_contexto = 0
+        self.ultima_tarefa = None
+
+
+    def _dispatch(self):
+        '''
+            Contabiliza a decisão de escalonamento e a troca de contexto ao
+            colocar tarefa_no_momento na CPU.
+        '''
+
+        self.escalonamentos += 1
+
+        if self.ultima_tarefa is not None and self.tarefa_no_momento is not self.ultima_tarefa:
+            self.trocas_de_contexto += 1
+
+        self.ultima_tarefa = self.tarefa_no_momento
 
 
     def _start_new_task(self, scheduler):
@@ -23,7 +47,8 @@ class BaseAlgorithm(ABC):
         '''
 
         self.tarefa_no_momento = scheduler.ready_threads.pop()
-        print(f"Thread: {self.tarefa_no_momento.id} escalonada no tempo de clock {scheduler.current_clock}\n")
+        self._dispatch()
+        logger.debug("Thread: %s escalonada no tempo de clock %s\n", self.tarefa_no_momento.id, scheduler.current_clock)
         self.tarefa_em_execucao = True
 
 
@@ -32,20 +57,16 @@ class BaseAlgorithm(ABC):
             Realiza a troca de contexto entre tarefas em algoritmos preemptivos.
             
             Move a tarefa atual de volta para a fila de prontos e escalona a próxima tarefa.
-            A estratégia de inserção depende do tipo de algoritmo (duração vs prioridade).    
+            A posição de reinserção é definida pela fila de prontos (duração vs prioridade).    
         '''
         
-        print(f"Thread: {self.tarefa_no_momento.id} retornou a fila de tarefas prontas no clock {scheduler.current_clock}\n")
+        logger.debug("Thread: %s retornou a fila de tarefas prontas no clock %s\n", self.tarefa_no_momento.id, scheduler.current_clock)
         nova_tarefa = scheduler.ready_threads.pop()
-
-        if scheduler.algoritmo_de_insercao == "duração":
-            scheduler.insert_by_shortest_time(self.tarefa_no_momento)
-        
-        elif scheduler.algoritmo_de_insercao == "prioridade":
-            scheduler.insert_by_priority(self.tarefa_no_momento)
+        scheduler.ready_threads.push(self.tarefa_no_momento)
 
         self.tarefa_no_momento = nova_tarefa
-        print(f"Thread: {self.tarefa_no_momento.id} escalonada no tempo de clock {scheduler.current_clock}\n")
+        self._dispatch()
+        logger.debug("Thread: %s escalonada no tempo de clock %s\n", self.tarefa_no_momento.id, scheduler.current_clock)
 
 
     def _complete_task(self, scheduler):
@@ -57,29 +78,97 @@ class BaseAlgorithm(ABC):
         tempo_ingresso = self.tarefa_no_momento.tempo_ingresso
         tempo_finalizacao = int(scheduler.current_clock)
         turnaround_time = tempo_finalizacao - tempo_ingresso
-        waiting_time = turnaround_time - self.tarefa_no_momento.duracao_prevista.tempo_total
+        waiting_time = turnaround_time - self.tarefa_no_momento.tempo_total
 
-        self.tarefas_concluidas.append(Tarefa_Finalizada(
+        scheduler.record_completed_task(Tarefa_Finalizada(
             id_tarefa, tempo_ingresso, tempo_finalizacao,
             turnaround_time, waiting_time
         ))
         
-        print(f"Thread: {id_tarefa} finalizada no clock {tempo_finalizacao}\n")
+        logger.debug("Thread: %s finalizada no clock %s\n", id_tarefa, tempo_finalizacao)
         self.tarefa_em_execucao = False
 
 
+    def execute(self, scheduler):
+        '''
+            Loop principal do escalonador, comum a todos os algoritmos.
+
+            A cada novo valor de clock recebido, executa um ciclo do algoritmo
+            (process_tick) e confirma o clock ao escalonador. O loop termina quando o emissor finalizou as emissões,
+            a fila de prontos está vazia e não há tarefa em execução.
+
+            Com a instrumentação ativa (scheduler.metricas), mede check_messages
+            (incluindo a espera por mensagens) e o ciclo de cada tick.
+        '''
+
+        metricas = scheduler.metricas
+        medir = metricas.enabled    # Evita as chamadas vazias por tick com a instrumentação desligada
+
+        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
+            
+            if medir:
+                inicio = metricas.start()
+                scheduler.check_messages()
+                metricas.record("check_messages", inicio)
+            else:
+                scheduler.check_messages()
+
+            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
+                logger.debug("Clock: %s, Threads prontas: %d", scheduler.current_clock, len(scheduler.ready_threads))
+
+                if medir:
+                    inicio = metricas.start()
+                    self.process_tick(scheduler)
+                    metricas.record("tick", inicio)
+                    metricas.export_if_due()
+                else:
+                    self.process_tick(scheduler)
+
+                self.old_clock = scheduler.current_clock
+                scheduler.confirm_tick()
+
+        self._finalize_execution(scheduler)
+
+
+    @abstractmethod
+    def process_tick(self, scheduler):
+        '''
+            Executa um ciclo de clock do algoritmo.
+
+            Deve escalonar, preemptar ou concluir tarefas conforme a política
+            e registrar no máximo uma unidade de execução no arquivo de saída.
+            Quando uma tarefa termina, o mesmo ciclo é reavaliado para que a
+            CPU não fique ociosa no clock em que houve a conclusão.
+        '''
+        pass
+
+
     def _finalize_execution(self, scheduler):
         '''
             Finaliza a execução do algoritmo
         '''
         
-        print("Tarefas concluídas!")
-        scheduler.file_writer.write_final_statistics(self.tarefas_concluidas)
+        logger.info("Tarefas concluídas! %d threads, %d escalonamentos, %d trocas de contexto",
+                    scheduler.file_writer.turnaround.quantidade, self.escalonamentos, self.trocas_de_contexto)
+        scheduler.file_writer.write_final_statistics()
+        scheduler.metricas.close()
         scheduler.communication_clock()
         scheduler.communication_emitter()
         scheduler.close_server()
-        grafico_tarefas_escalonadas(scheduler.file_writer.output_file)
-        print("ESCALONADOR ENCERRADO POR COMPLETO!")
+
+        if scheduler.gerar_grafico:
+            self._render_chart(scheduler)
+
+        logger.info("ESCALONADOR ENCERRADO POR COMPLETO!")
+
+
+    def _render_chart(self, scheduler):
+        '''
+            Gera o diagrama de Gantt da execução em segundo plano, a partir
+            do arquivo de saída já finalizado (ver diagrama_Gantt.py).
+        '''
+
+        iniciar_renderizacao(scheduler.file_writer.output_file)
 
 
 class NonPreemptiveAlgorithm(BaseAlgorithm):
@@ -88,41 +177,33 @@ class NonPreemptiveAlgorithm(BaseAlgorithm):
         A diferença entre eles é apenas a política de inserção na fila
     '''
     
-    def execute(self, scheduler):
+    def process_tick(self, scheduler):
         '''
-            Executa algoritmos não-preemptivos (FCFS, SJF ou PRIOc)
+            Executa um ciclo dos algoritmos não-preemptivos (FCFS, SJF ou PRIOc)
             A fila já vem ordenada conforme a política escolhida
         '''
 
-        # Loop principal do escalonador
-        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
-            
-            scheduler.check_messages()
-
-            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
-                print(f"Clock: {scheduler.current_clock}, Threads prontas: {len(scheduler.ready_threads)}")
+        while True:
 
-                # Iniciar nova tarefa se não há nenhuma em execução
-                if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
-                    self._start_new_task(scheduler)
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)
 
-                # Processar tarefa em execução
-                if self.tarefa_em_execucao:
-                    
-                    # Verificar se a tarefa foi concluída
-                    if self.tarefa_no_momento.duracao_prevista.tempo_restante == 0:
-                        self._complete_task(scheduler)
-                        continue
-                    
-                    # Escrever no arquivo de saída
-                    scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
-                    
-                    # Decrementar a duração da tarefa
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante -= 1
-                    
-                self.old_clock = scheduler.current_clock
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+                
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
+                
+                # Decrementar a duração da tarefa
+                self.tarefa_no_momento.tempo_restante -= 1
 
-        self._finalize_execution(scheduler)
+            return
 
 
 class RR_Algorithm(BaseAlgorithm):
@@ -137,50 +218,226 @@ class RR_Algorithm(BaseAlgorithm):
     def __init__(self, quantum: int):
         super().__init__()
         self.quantum = quantum
+        self.quantum_da_tarefa = 0
     
 
-    def execute(self, scheduler):
+    def process_tick(self, scheduler):
         '''
-            Executa o algoritmo Round Robin no escalonador fornecido
+            Executa um ciclo do algoritmo Round Robin no escalonador fornecido
         '''
-        quantum_da_tarefa = 0
-        
-        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
-            
-            scheduler.check_messages()
 
-            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
-                print(f"Clock: {scheduler.current_clock}, Threads prontas: {len(scheduler.ready_threads)}")
+        while True:
 
-                # Iniciar nova tarefa se não há nenhuma em execução
-                if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
-                    self._start_new_task(scheduler)  
-                    quantum_da_tarefa = self.quantum
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)  
+                self.quantum_da_tarefa = self.quantum
 
-                # Processar tarefa em execução
-                if self.tarefa_em_execucao:
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+
+                # Verificar se quantum acabou e há outras tarefas
+                elif self.quantum_da_tarefa == 0 and len(scheduler.ready_threads) > 0:
+                    logger.debug("Thread: %s retornou a fila de espera no clock %s\n", self.tarefa_no_momento.id, scheduler.current_clock)
+                    scheduler.ready_threads.push(self.tarefa_no_momento)
+                    self.tarefa_em_execucao = False
+                    continue
+                
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
                     
-                    # Verificar se a tarefa foi concluída
-                    if self.tarefa_no_momento.duracao_prevista.tempo_restante == 0:
-                        self._complete_task(scheduler)
+                self.tarefa_no_momento.tempo_restante -= 1
+                self.quantum_da_tarefa -= 1
+
+            return
+
+
+class MLFQ_Algorithm(BaseAlgorithm):
+    '''
+        Implementa o algoritmo Multilevel Feedback Queue (MLFQ).
+
+        Algoritmo preemptivo com uma fila por nível (ver MultilevelReadyQueue),
+        cada nível com seu quantum. Novas threads entram no nível 0 (mais
+        prioritário):
+        - Se a thread esgota o quantum do seu nível, desce um nível (até o último)
+        - Uma thread de nível mais prioritário que fique pronta preempta a atual,
+          que volta para o fim do seu nível
+        - O tempo executado no nível (thread.tempo_no_nivel) é acumulado entre
+          preempções: o quantum é o total que a thread pode usar no nível, e
+          não é renovado quando ela volta à CPU
+        - A cada *periodo_boost* clocks, todas as threads voltam ao nível 0,
+          evitando starvation das threads longas
+
+        A escolha da próxima thread é O(1), independentemente do tamanho da fila.
+    '''
+
+    def __init__(self, quanta: tuple[int, ...], periodo_boost: int):
+        '''
+            *quanta*: quantum de cada nível, do mais prioritário ao menos prioritário
+            *periodo_boost* (int): clocks entre dois boosts
+        '''
+
+        super().__init__()
+        self.quanta = quanta
+        self.periodo_boost = periodo_boost
+        self.clocks = 0
+
+
+    def process_tick(self, scheduler):
+        '''
+            Executa um ciclo do algoritmo MLFQ no escalonador fornecido
+        '''
+
+        # Boost periódico: todas as threads, inclusive a atual, voltam ao nível 0,
+        # com o quantum do nível 0
+        self.clocks += 1
+        if self.clocks % self.periodo_boost == 0:
+            scheduler.ready_threads.boost()
+
+            if self.tarefa_em_execucao:
+                self.tarefa_no_momento.nivel = 0
+                self.tarefa_no_momento.tempo_no_nivel = 0
+
+        ultimo_nivel = len(self.quanta) - 1
+
+        while True:
+
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)
+
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+
+                # Quantum do nível esgotado: a tarefa desce um nível
+                elif self.tarefa_no_momento.tempo_no_nivel >= self.quanta[self.tarefa_no_momento.nivel]:
+                    tarefa = self.tarefa_no_momento
+                    tarefa.nivel = min(tarefa.nivel + 1, ultimo_nivel)
+                    tarefa.tempo_no_nivel = 0
+
+                    if len(scheduler.ready_threads) > 0:
+                        logger.debug("Thread: %s desceu para o nível %d no clock %s\n", tarefa.id, tarefa.nivel, scheduler.current_clock)
+                        scheduler.ready_threads.push(tarefa)
+                        self.tarefa_em_execucao = False
                         continue
 
-                    # Verificar se quantum acabou e há outras tarefas
-                    elif quantum_da_tarefa == 0 and len(scheduler.ready_threads) > 0:
-                        print(f"Thread: {self.tarefa_no_momento.id} retornou a fila de espera no clock {scheduler.current_clock}\n")
-                        scheduler.ready_threads.appendleft(self.tarefa_no_momento)
+                    # Sem outras tarefas, continua executando no novo nível
+
+                # Preempção por uma tarefa de nível mais prioritário
+                elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads.highest_level() < self.tarefa_no_momento.nivel:
+                    logger.debug("Thread: %s retornou a fila de espera no clock %s\n", self.tarefa_no_momento.id, scheduler.current_clock)
+                    scheduler.ready_threads.push(self.tarefa_no_momento)
+                    self.tarefa_em_execucao = False
+                    continue
+
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
+
+                self.tarefa_no_momento.tempo_restante -= 1
+                self.tarefa_no_momento.tempo_no_nivel += 1
+
+            return
+
+
+class CFS_Algorithm(BaseAlgorithm):
+    '''
+        Implementa um escalonador completamente justo (CFS), como o do Linux.
+
+        Cada thread acumula tempo de execução virtual (vruntime) inversamente
+        proporcional ao seu peso, derivado da prioridade (ver
+        peso_da_prioridade), e a fila de prontos (VirtualRuntimeReadyQueue)
+        entrega sempre a de menor vruntime. Em sobrecarga, cada thread recebe
+        CPU na proporção do seu peso.
+
+        Em vez de um quantum fixo, a fatia de tempo da thread é a sua parte
+        (peso / peso total) de um período de *latencia_alvo* clocks, em que
+        todas as threads prontas executam uma vez. Com muitas threads, o
+        período cresce para que nenhuma fatia seja menor que
+        *granularidade_minima* clocks. Ao fim da fatia, a thread é preemptada
+        se outra tiver vruntime menor.
+
+        Complexidade: O(log n) por decisão de escalonamento.
+    '''
+
+    def __init__(self, latencia_alvo: int, granularidade_minima: int):
+        '''
+            *latencia_alvo* (int): período, em clocks, em que todas as threads prontas executam
+            *granularidade_minima* (int): menor fatia de tempo, em clocks
+        '''
+
+        super().__init__()
+        self.latencia_alvo = latencia_alvo
+        self.granularidade_minima = granularidade_minima
+        self.fatia = 0
+        self.executado_na_fatia = 0
+
+
+    def _time_slice(self, scheduler) -> int:
+        '''
+            Fatia de tempo da tarefa em execução, proporcional ao seu peso.
+        '''
+
+        fila = scheduler.ready_threads
+        peso = peso_da_prioridade(self.tarefa_no_momento.prio_e)
+        periodo = max(self.latencia_alvo, (len(fila) + 1) * self.granularidade_minima)
+
+        return max(self.granularidade_minima, periodo * peso // (fila.peso_total + peso))
+
+
+    def process_tick(self, scheduler):
+        '''
+            Executa um ciclo do algoritmo CFS no escalonador fornecido
+        '''
+
+        fila = scheduler.ready_threads
+
+        while True:
+
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(fila) > 0:
+                self._start_new_task(scheduler)
+                self.fatia = self._time_slice(scheduler)
+                self.executado_na_fatia = 0
+
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                tarefa = self.tarefa_no_momento
+
+                # Verificar se a tarefa foi concluída
+                if tarefa.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+
+                # Fatia esgotada: cede a CPU se outra tarefa tem vruntime menor
+                elif self.executado_na_fatia >= self.fatia:
+                    if len(fila) > 0 and fila.peek().vruntime < tarefa.vruntime:
+                        logger.debug("Thread: %s retornou a fila de espera no clock %s\n", tarefa.id, scheduler.current_clock)
+                        fila.push(tarefa)
                         self.tarefa_em_execucao = False
                         continue
-                    
-                    # Escrever no arquivo de saída
-                    scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
-                        
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante -= 1
-                    quantum_da_tarefa -= 1
-                        
-                self.old_clock = scheduler.current_clock
 
-        self._finalize_execution(scheduler)
+                    self.fatia = self._time_slice(scheduler)
+                    self.executado_na_fatia = 0
+
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(tarefa.id)
+
+                tarefa.tempo_restante -= 1
+                tarefa.vruntime += ESCALA_VRUNTIME * PESO_BASE // peso_da_prioridade(tarefa.prio_e)
+                self.executado_na_fatia += 1
+                fila.update_min_vruntime(tarefa.vruntime)
+
+            return
 
 
 class SRTF_Algorithm(BaseAlgorithm):
@@ -192,43 +449,35 @@ class SRTF_Algorithm(BaseAlgorithm):
         menor que a tarefa atual, ocorre preempção imediatamente.
     """
     
-    def execute(self, scheduler):
+    def process_tick(self, scheduler):
         '''
-            Executa o algoritmo Shortest Remaining Time First (SRTF).
+            Executa um ciclo do algoritmo Shortest Remaining Time First (SRTF).
         '''
 
-        # Loop principal do escalonador
-        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
-            
-            scheduler.check_messages()
+        while True:
 
-            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
-                print(f"Clock: {scheduler.current_clock}, Threads prontas: {len(scheduler.ready_threads)}")
-
-                # Iniciar nova tarefa se não há nenhuma em execução
-                if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
-                    self._start_new_task(scheduler)
- 
-                # Processar tarefa em execução
-                if self.tarefa_em_execucao:
-                    
-                    # Verificar se a tarefa foi concluída
-                    if self.tarefa_no_momento.duracao_prevista.tempo_restante == 0:
-                        self._complete_task(scheduler)
-                        continue
-                    
-                    elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads[-1].duracao_prevista.tempo_restante < self.tarefa_no_momento.duracao_prevista.tempo_restante:
-                        self._task_switching(scheduler)
-                    
-                    # Escrever no arquivo de saída
-                    scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
-                    
-                    # Decrementar a duração da tarefa
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante -= 1
-                    
-                self.old_clock = scheduler.current_clock
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)
 
-        self._finalize_execution(scheduler)
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+                
+                elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads.peek().tempo_restante < self.tarefa_no_momento.tempo_restante:
+                    self._task_switching(scheduler)
+                
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
+                
+                # Decrementar a duração da tarefa
+                self.tarefa_no_momento.tempo_restante -= 1
+
+            return
 
 
 class PRIOp_Algorithm(BaseAlgorithm):
@@ -240,44 +489,35 @@ class PRIOp_Algorithm(BaseAlgorithm):
         menor que a tarefa atualmente em execução, ocorre preempção imediata.
     """
 
-    def execute(self, scheduler):
+    def process_tick(self, scheduler):
         '''
-            Executa o algoritmo Prioridade Preemptiva (PRIOp)
+            Executa um ciclo do algoritmo Prioridade Preemptiva (PRIOp)
         '''
 
-        # Loop principal do escalonador
-        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
-            
-            scheduler.check_messages()
-
-            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
-                print(f"Clock: {scheduler.current_clock}, Threads prontas: {len(scheduler.ready_threads)}")
-
-                # Iniciar nova tarefa se não há nenhuma em execução
-                if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
-                    self._start_new_task(scheduler)
+        while True:
 
-                # Processar tarefa em execução
-                if self.tarefa_em_execucao:
-                    
-                    # Verificar se a tarefa foi concluída
-                    if self.tarefa_no_momento.duracao_prevista.tempo_restante == 0:
-                        self._complete_task(scheduler)
-                        continue
-                    
-                    elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads[-1].prioridade.prio_d < self.tarefa_no_momento.prioridade.prio_d:
-                        self._task_switching(scheduler)
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)
 
-                    # Escrever no arquivo de saída
-                    scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
-                    
-                    # Decrementar a duração da tarefa
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante -= 1
-                    
-                self.old_clock = scheduler.current_clock
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    continue
+                
+                elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads.peek().prio_d < self.tarefa_no_momento.prio_d:
+                    self._task_switching(scheduler)
 
-        self._finalize_execution(scheduler)
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
+                
+                # Decrementar a duração da tarefa
+                self.tarefa_no_momento.tempo_restante -= 1
 
+            return
 
 
 class PRIOd_Algorithm(BaseAlgorithm):
@@ -288,52 +528,44 @@ class PRIOd_Algorithm(BaseAlgorithm):
         baseado em prioridades que se ajustam dinamicamente durante a execução.
     """
     
-    def execute(self, scheduler):
+    def process_tick(self, scheduler):
         '''
-            Executa o algoritmo Prioridade Dinâmica (PRIOd).
+            Executa um ciclo do algoritmo Prioridade Dinâmica (PRIOd).
         '''
 
-        # Loop principal do escalonador
-        while not (scheduler.emitter_completed and len(scheduler.ready_threads) == 0 and not self.tarefa_em_execucao):
-            
-            scheduler.check_messages()
+        while True:
 
-            if self.old_clock != scheduler.current_clock and scheduler.current_clock is not None:
-                print(f"Clock: {scheduler.current_clock}, Threads prontas: {len(scheduler.ready_threads)}")
-
-                # Iniciar nova tarefa se não há nenhuma em execução
-                if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
-                    self._start_new_task(scheduler)
-                    self.tarefa_no_momento.prioridade.prio_d = self.tarefa_no_momento.prioridade.prio_e
+            # Iniciar nova tarefa se não há nenhuma em execução
+            if not self.tarefa_em_execucao and len(scheduler.ready_threads) > 0:
+                self._start_new_task(scheduler)
+                self.tarefa_no_momento.prio_d = self.tarefa_no_momento.prio_e
+            
+            elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads.peek().prio_d < self.tarefa_no_momento.prio_d and \
+                self.tarefa_no_momento.tempo_restante != 0 and scheduler.new_emiiter:
                 
-                elif len(scheduler.ready_threads) > 0 and scheduler.ready_threads[-1].prioridade.prio_d < self.tarefa_no_momento.prioridade.prio_d and \
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante != 0 and scheduler.new_emiiter:
-                    
-                    self._task_switching(scheduler)
-                    self.tarefa_no_momento.prioridade.prio_d = self.tarefa_no_momento.prioridade.prio_e   
-           
-           
-                # Processar tarefa em execução
-                if self.tarefa_em_execucao:
-                    
-                    # Verificar se a tarefa foi concluída
-                    if self.tarefa_no_momento.duracao_prevista.tempo_restante == 0:
-                        self._complete_task(scheduler)
-                        scheduler.new_emiiter = True
-                        continue  
-
-                    
-                    # Escrever no arquivo de saída
-                    scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
-                    
-                    # Decrementar a duração da tarefa
-                    self.tarefa_no_momento.duracao_prevista.tempo_restante -= 1
-                    
+                self._task_switching(scheduler)
+                self.tarefa_no_momento.prio_d = self.tarefa_no_momento.prio_e   
+       
+       
+            # Processar tarefa em execução
+            if self.tarefa_em_execucao:
+                
+                # Verificar se a tarefa foi concluída
+                if self.tarefa_no_momento.tempo_restante == 0:
+                    self._complete_task(scheduler)
+                    scheduler.new_emiiter = True
+                    continue  
 
-                if scheduler.new_emiiter:
-                    scheduler.increment_priority()
-                    scheduler.new_emiiter = False
+                
+                # Escrever no arquivo de saída
+                scheduler.file_writer.write_thread_execution(self.tarefa_no_momento.id)
+                
+                # Decrementar a duração da tarefa
+                self.tarefa_no_momento.tempo_restante -= 1
+                
 
-                self.old_clock = scheduler.current_clock
+            if scheduler.new_emiiter:
+                scheduler.increment_priority()
+                scheduler.new_emiiter = False
 
-        self._finalize_execution(scheduler)
+            return
@@ -1,6 +1,18 @@
 import socket
+import selectors
+import struct
 import json
+import logging
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from metrics import NullMetrics
+from message_trace import TraceRecorder
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho de cada mensagem: tamanho do conteúdo em bytes (uint32 big-endian)
+CABECALHO = struct.Struct("!I")
 
 class BaseServer(ABC):
     """
@@ -9,6 +21,16 @@ class BaseServer(ABC):
         Fornece implementação padrão para criação, gerenciamento e encerramento
         de servidores, deixando apenas o processamento de mensagens específico
         para as classes filhas implementarem.
+
+        As conexões entre os componentes são persistentes: cada servidor mantém
+        uma conexão de saída por destino e aceita conexões de entrada de longa
+        duração. Cada mensagem trafega com um cabeçalho de 4 bytes contendo o
+        tamanho do conteúdo, de forma que uma mesma conexão transporta uma
+        sequência ilimitada de mensagens de qualquer tamanho.
+
+        A entrada é orientada a eventos (selectors): o servidor dorme até
+        haver tráfego em alguma conexão, lê tudo o que está disponível em
+        todas as conexões prontas e despacha as mensagens para process_message().
     """
     
     def __init__(self, host, port, server_name):
@@ -24,59 +46,224 @@ class BaseServer(ABC):
         self.port = port
         self.server_name = server_name
         self.servidor = None
+        self.timeout = 0.1                      # Espera máxima por mensagens em check_messages()
+
+        # Conexões persistentes
+        self.conexoes_entrada: dict[socket.socket, bytearray] = {}     # Conexão -> bytes pendentes
+        self.conexoes_saida: dict[tuple, socket.socket] = {}           # (host, porta) -> conexão
+
+        # Mensagens recebidas completas, aguardando processamento
+        self.mensagens_recebidas: deque[str] = deque()
+
+        # Multiplexador de eventos de entrada (criado em create_server)
+        self.seletor = None
+
+        # Instrumentação (desativada por padrão; ver metrics.Metrics)
+        self.metricas = NullMetrics()
+
+        # Gravação das mensagens recebidas (desativada por padrão; ver start_trace)
+        self.gravador: TraceRecorder | None = None
         
     
     def create_server(self):
         """
             Cria e configura o servidor.
             
-            Estabelece um socket servidor que escuta na porta especificada,
-            configurado com timeout de 0.1s para permitir verificações não-bloqueantes
-            no loop principal da aplicação.
+            Estabelece um socket servidor que escuta na porta especificada.
+            As esperas por conexões e mensagens são feitas em check_messages(),
+            limitadas a self.timeout, para não bloquear o loop principal.
         """
         
-        print(f"Criando o servidor do {self.server_name}!")
+        logger.info("Criando o servidor do %s!", self.server_name)
 
-        # Criar socket
+        # Criar socket (permitindo reutilizar a porta logo após um encerramento)
         self.servidor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.servidor.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
         # Fazer bind e começar a escutar
         self.servidor.bind((self.host, self.port))
-        self.servidor.listen(3)             # Máximo 3 conexões pendentes
-        self.servidor.settimeout(0.1)       # Timeout CURTO para não bloquear muito
+        self.servidor.listen(socket.SOMAXCONN)
+        self.servidor.setblocking(False)
 
-        print(f"Servidor do {self.server_name} criado com sucesso! \n")
+        # Registrar o socket servidor no loop de eventos
+        self.seletor = selectors.DefaultSelector()
+        self.seletor.register(self.servidor, selectors.EVENT_READ, self._accept_connections)
+
+        logger.info("Servidor do %s criado com sucesso! \n", self.server_name)
     
 
-    def check_messages(self):
+    def check_messages(self, timeout: float | None = None):
         """
             Escuta e processa mensagens recebidas.
         
-            Aceita uma conexão (se disponível), recebe dados do cliente e
-            delega o processamento para o método process_message() implementado
-            pelas classes filhas. A conexão é automaticamente fechada após
-            o processamento.
+            Se não há mensagem pendente, dorme até haver tráfego (no máximo
+            *timeout* segundos, por padrão self.timeout) e lê todos os dados
+            disponíveis em todas as conexões prontas. Em seguida despacha as
+            mensagens pendentes, em ordem, para o método process_message()
+            implementado pelas classes filhas.
+
+            O despacho para logo após uma mensagem de barreira (ver
+            is_barrier_message), deixando as seguintes para a próxima chamada,
+            para que o loop principal possa reagir a cada pulso de clock.
+
+            Com a gravação ativa (start_trace), cada mensagem despachada é
+            gravada no trace antes de ser processada.
         """
        
         try:
-            # Aceitar conexão
-            cliente, endereco = self.servidor.accept()
-            
-            # Receber dados
-            message = cliente.recv(1024).decode('utf-8')
-            
-            # Processar mensagem usando método específico da classe filha
-            self.process_message(message)
-            
-            # Fechar conexão
-            cliente.close()
+            if not self.mensagens_recebidas:
+                self._poll(self.timeout if timeout is None else timeout)
+
+            gravador = self.gravador
+            if gravador is not None and self.mensagens_recebidas:
+                gravador.next_dispatch()
+
+            while self.mensagens_recebidas:
+                message = self.mensagens_recebidas.popleft()
 
-        except socket.timeout:
-            # Normal - não havia mensagem
-            pass
+                if gravador is not None:
+                    gravador.record(getattr(self, "current_clock", None), message)
+
+                # Processar mensagem usando método específico da classe filha
+                inicio = self.metricas.start()
+                self.process_message(message)
+                self.metricas.record("processamento", inicio)
+
+                if self.is_barrier_message(message):
+                    break
                 
         except Exception as e:
-            print(f"Erro no servidor: {e}")
+            logger.error("Erro no servidor: %s", e)
+
+
+    def start_trace(self, arquivo: str):
+        """
+            Ativa a gravação das mensagens recebidas em *arquivo*.
+
+            Cada mensagem despachada por check_messages() é gravada com o
+            clock corrente do servidor (atributo current_clock, se houver) e
+            o despacho em que foi processada (ver message_trace.TraceRecorder).
+            O trace é fechado em close_server() e pode ser reproduzido com
+            replay.py.
+        """
+
+        self.gravador = TraceRecorder(arquivo)
+
+
+    def wait(self, segundos: float):
+        """
+            Aguarda *segundos* processando as mensagens que chegarem no período.
+
+            Substitui time.sleep() nos loops dos componentes: o servidor dorme
+            no loop de eventos e acorda imediatamente quando há tráfego.
+        """
+
+        limite = time.monotonic() + segundos
+
+        while True:
+            restante = limite - time.monotonic()
+
+            if restante <= 0:
+                break
+
+            self.check_messages(restante)
+
+
+    def is_barrier_message(self, message) -> bool:
+        """
+            Indica se a mensagem marca o avanço do tempo (ex.: pulso de clock).
+
+            Mensagens de barreira recebidas em uma mesma leitura são enfileiradas
+            depois das demais, e cada chamada de check_messages() despacha no
+            máximo uma delas. Por padrão nenhuma mensagem é de barreira.
+        """
+
+        return False
+
+
+    def _poll(self, timeout):
+        """
+            Aguarda eventos por até *timeout* segundos e atende cada conexão pronta.
+
+            Mensagens completas lidas nesta rodada são colocadas em
+            self.mensagens_recebidas: primeiro as comuns, depois as de
+            barreira, preservando a ordem de chegada dentro de cada grupo.
+        """
+
+        novas: list[str] = []
+        eventos = self.seletor.select(timeout)
+
+        if not eventos:
+            return
+
+        # A espera no select não é medida, apenas a leitura das conexões prontas
+        inicio = self.metricas.start()
+
+        for chave, _ in eventos:
+            chave.data(chave.fileobj, novas)
+
+        # Separa as mensagens comuns das de barreira em uma única passagem
+        barreiras: list[str] = []
+        comuns: list[str] = []
+
+        for mensagem in novas:
+            (barreiras if self.is_barrier_message(mensagem) else comuns).append(mensagem)
+
+        self.mensagens_recebidas.extend(comuns)
+        self.mensagens_recebidas.extend(barreiras)
+        self.metricas.record("leitura", inicio)
+
+
+    def _accept_connections(self, servidor, novas):
+        """
+            Aceita todas as conexões pendentes e as registra no loop de eventos.
+        """
+
+        while True:
+            try:
+                cliente, endereco = servidor.accept()
+            except BlockingIOError:
+                return
+
+            cliente.setblocking(False)
+            self.conexoes_entrada[cliente] = bytearray()
+            self.seletor.register(cliente, selectors.EVENT_READ, self._read_connection)
+
+
+    def _read_connection(self, conexao, novas):
+        """
+            Lê todos os dados disponíveis da conexão e separa as mensagens completas.
+        """
+
+        pendente = self.conexoes_entrada[conexao]
+
+        while True:
+            try:
+                dados = conexao.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                dados = b""
+
+            # Conexão encerrada pelo outro lado: descarta mensagem incompleta
+            if not dados:
+                self.seletor.unregister(conexao)
+                del self.conexoes_entrada[conexao]
+                conexao.close()
+                break
+
+            pendente += dados
+
+        # Separar mensagens completas
+        while len(pendente) >= CABECALHO.size:
+            (tamanho,) = CABECALHO.unpack_from(pendente)
+            fim = CABECALHO.size + tamanho
+
+            if len(pendente) < fim:
+                break
+
+            novas.append(pendente[CABECALHO.size:fim].decode('utf-8'))
+            del pendente[:fim]
      
 
     @abstractmethod
@@ -99,33 +286,90 @@ class BaseServer(ABC):
             Chamado automaticamente ao finalizar o sistema.
         """
 
-        print(f"\nEncerrando o servidor do {self.server_name}!")
+        logger.info("\nEncerrando o servidor do %s!", self.server_name)
+
+        if self.seletor:
+            self.seletor.close()
 
         if self.servidor:
             self.servidor.close()
 
-        print(f"Servidor do {self.server_name} encerrado com sucesso! \n")
+        # Encerrar conexões persistentes
+        for conexao in [*self.conexoes_entrada, *self.conexoes_saida.values()]:
+            conexao.close()
+
+        self.conexoes_entrada.clear()
+        self.conexoes_saida.clear()
+
+        if self.gravador is not None:
+            self.gravador.close()
+            logger.info("Trace gravado em %s: %d mensagens", self.gravador.arquivo_trace, self.gravador.mensagens)
+            self.gravador = None
+
+        logger.info("Servidor do %s encerrado com sucesso! \n", self.server_name)
     
     
     def send_message(self, target_host, target_port, message):
         """
             Envia mensagem para outro servidor.
             
-            Estabelece conexão temporária com o servidor destino, envia a
-            mensagem e fecha a conexão imediatamente.
+            Reutiliza a conexão persistente com o servidor destino, criando-a
+            na primeira mensagem. Se a conexão tiver sido perdida, ela é
+            recriada e o envio é repetido uma vez.
+
+            Retorna True se a mensagem foi entregue à conexão.
         """
 
-        try:
+        inicio = self.metricas.start()
+        conteudo = message.encode('utf-8')
+        mensagem = CABECALHO.pack(len(conteudo)) + conteudo
+
+        for tentativa in range(2):
+            try:
+                cliente = self._get_connection(target_host, target_port)
+                cliente.sendall(mensagem)
+                self.metricas.record("envio", inicio)
+                return True
+
+            except Exception as e:
+                self._drop_connection(target_host, target_port)
+
+                if tentativa == 1:
+                    logger.error("Erro ao enviar mensagem: %s", e)
+
+        return False
+
+
+    def _get_connection(self, target_host, target_port):
+        """
+            Retorna a conexão persistente com o destino, conectando se necessário.
+        """
+
+        destino = (target_host, target_port)
+        cliente = self.conexoes_saida.get(destino)
+
+        if cliente is None:
             cliente = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             cliente.settimeout(1.0)  # Timeout para conexão
+            cliente.connect(destino)
+
+            # Após conectado, envios bloqueiam até a mensagem inteira ser aceita
+            cliente.settimeout(None)
+            cliente.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.conexoes_saida[destino] = cliente
+
+        return cliente
+
+
+    def _drop_connection(self, target_host, target_port):
+        """
+            Fecha e descarta a conexão persistente com o destino, se existir.
+        """
+
+        cliente = self.conexoes_saida.pop((target_host, target_port), None)
 
-            # Conectar e enviar
-            cliente.connect((target_host, target_port))
-            cliente.send(message.encode('utf-8'))
+        if cliente is not None:
             cliente.close()
-            
-        except Exception as e:
-            print(f"Erro ao enviar mensagem: {e}")
     
     
     def send_json_message(self, target_host, target_port, data):
@@ -134,10 +378,13 @@ class BaseServer(ABC):
             
             Converte o dicionário em JSON e envia via send_message().
             Útil para comunicação estruturada entre servidores.
+
+            Retorna True se a mensagem foi entregue à conexão.
         """
         
         try:
             message = json.dumps(data)
-            self.send_message(target_host, target_port, message)
+            return self.send_message(target_host, target_port, message)
         except Exception as e:
-            print(f"Erro ao enviar mensagem JSON: {e}")
\ No newline at end of file
+            logger.error("Erro ao enviar mensagem JSON: %s", e)
+            return False
\ No newline at end of file
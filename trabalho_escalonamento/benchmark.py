@@ -0,0 +1,247 @@
+from concurrent.futures import ProcessPoolExecutor
+from comparar_algoritmos import ALGORITMOS, silenciar_logs
+from binary_tasks import convert_task_file
+from simulador import SIMULADOR
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import tempfile
+import time
+
+# Tamanhos de carga padrão (quantidade de tarefas)
+TAMANHOS = (1_000, 10_000, 100_000, 1_000_000)
+
+# Fração do tempo em que a CPU estaria ocupada com a taxa de chegada gerada
+CARGA_CPU = 0.9
+
+# Carga do cenário "sobrecarga": chegam mais tarefas do que a CPU executa
+CARGA_SOBRECARGA = 1.5
+
+# Cenários de carga: padrão de chegada, distribuição de duração e de prioridade
+#   chegada: "poisson" (intervalos exponenciais) ou "rajadas" (lotes no mesmo clock)
+#   duracao: "uniforme" (1 a 9) ou "exponencial" (média 5, cauda longa)
+#   prioridade: "uniforme" (1 a 9) ou "concentrada" (maioria em poucos níveis)
+#   carga: fração de ocupação da CPU pela taxa de chegada
+CENARIOS = {
+    "poisson": {"chegada": "poisson", "duracao": "uniforme", "prioridade": "uniforme", "carga": CARGA_CPU},
+    "rajadas": {"chegada": "rajadas", "duracao": "uniforme", "prioridade": "uniforme", "carga": CARGA_CPU},
+    "cauda_longa": {"chegada": "poisson", "duracao": "exponencial", "prioridade": "concentrada", "carga": CARGA_CPU},
+    "sobrecarga": {"chegada": "poisson", "duracao": "uniforme", "prioridade": "uniforme", "carga": CARGA_SOBRECARGA},
+}
+
+# Duração média das tarefas geradas
+DURACAO_MEDIA = 5
+
+# Tarefas por rajada no cenário "rajadas"
+TAMANHO_RAJADA = 50
+
+
+def gerar_carga(nome_arquivo: str, tarefas: int, cenario: str, semente: int = 0):
+    '''
+        Gera um arquivo de tarefas sintético (id;tempo_ingresso;duracao_prevista;prioridade).
+
+        A taxa de chegada é escolhida para ocupar a CPU na fração "carga" do
+        cenário. Com carga < 1 (CARGA_CPU), a fila de prontos fica limitada,
+        independentemente da quantidade de tarefas: mede o custo por decisão
+        com filas curtas, sem que a simulação fique dominada por clocks
+        ociosos. Com carga > 1 ("sobrecarga"), as chegadas superam a
+        capacidade da CPU e a fila cresce linearmente com a quantidade de
+        tarefas, exercitando inserção e remoção em filas longas.
+    '''
+
+    config = CENARIOS[cenario]
+    aleatorio = random.Random(semente)
+    intervalo_medio = DURACAO_MEDIA / config["carga"]
+    tempo = 0.0
+
+    with open(nome_arquivo, "w") as arq:
+        for i in range(tarefas):
+
+            if config["chegada"] == "rajadas":
+                if i % TAMANHO_RAJADA == 0 and i > 0:
+                    tempo += intervalo_medio * TAMANHO_RAJADA
+            else:
+                tempo += aleatorio.expovariate(1 / intervalo_medio)
+
+            if config["duracao"] == "exponencial":
+                duracao = max(1, round(aleatorio.expovariate(1 / DURACAO_MEDIA)))
+            else:
+                duracao = aleatorio.randint(1, 2 * DURACAO_MEDIA - 1)
+
+            if config["prioridade"] == "concentrada":
+                prioridade = min(9, 1 + int(aleatorio.expovariate(1)))
+            else:
+                prioridade = aleatorio.randint(1, 9)
+
+            arq.write(f"t{i};{int(tempo)};{duracao};{prioridade}\n")
+
+
+class SIMULADOR_MEDIDO(SIMULADOR):
+    '''
+        Simulação que registra o maior tamanho da fila de prontos.
+
+        A fila é medida a cada clock, após a chegada das tarefas do clock e
+        antes do processamento pelo algoritmo.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.maior_fila = 0
+
+
+    def check_messages(self):
+        super().check_messages()
+        self.maior_fila = max(self.maior_fila, len(self.ready_threads))
+
+
+def executar_caso(arquivo: str, algoritmo: str, pasta: str, cpus: int = 1):
+    '''
+        Executa uma simulação e mede seu desempenho.
+
+        Chamado em um processo novo para cada caso, de forma que o pico de
+        memória (RSS máximo do processo) corresponda apenas a este caso.
+        Apenas avisos e erros do escalonador são registrados (ver
+        silenciar_logs) e o diagrama de Gantt não é gerado.
+    '''
+
+    os.chdir(pasta)
+
+    inicio = time.perf_counter()
+    simulador = SIMULADOR_MEDIDO(arquivo, algoritmo, cpus=cpus)
+    simulador.gerar_grafico = False
+    carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    simulador.start()
+    duracao = time.perf_counter() - inicio
+
+    algoritmo_executado = simulador.algorithms[algoritmo]
+    clocks = simulador.virtual_clock + 1
+
+    return {
+        "clocks": clocks,
+        "escalonamentos": algoritmo_executado.escalonamentos,
+        "trocas_de_contexto": algoritmo_executado.trocas_de_contexto,
+        "maior_fila": simulador.maior_fila,
+        "tempo_carga_s": carga,
+        "tempo_s": duracao,
+        "decisoes_por_s": algoritmo_executado.escalonamentos / duracao if duracao else 0.0,
+        "tempo_por_clock_us": 1e6 * duracao / clocks,
+        "pico_memoria_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def executar_benchmark(tamanhos=TAMANHOS, cenarios=tuple(CENARIOS), algoritmos=ALGORITMOS, cpus: int = 1,
+                       semente: int = 0, binario: bool = False):
+    '''
+        Executa todos os casos (tamanho x cenário x algoritmo), um de cada vez.
+
+        Cada caso roda em um processo trabalhador descartado ao final, para
+        isolar o pico de memória e evitar interferência entre as medições.
+        Com *binario*, cada carga é convertida uma vez para o formato binário
+        (ver binary_tasks) e as execuções leem o arquivo via mmap.
+        Retorna a lista de resultados, na ordem de execução.
+    '''
+
+    resultados = []
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for tarefas in tamanhos:
+            for cenario in cenarios:
+                arquivo = os.path.join(pasta, f"carga_{cenario}_{tarefas}.txt")
+                gerar_carga(arquivo, tarefas, cenario, semente)
+
+                if binario:
+                    arquivo_texto, arquivo = arquivo, arquivo.replace(".txt", ".bin")
+                    convert_task_file(arquivo_texto, arquivo)
+                    os.remove(arquivo_texto)
+
+                for algoritmo in algoritmos:
+                    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1, initializer=silenciar_logs) as pool:
+                        medicao = pool.submit(executar_caso, arquivo, algoritmo, pasta, cpus).result()
+
+                    resultado = {"algoritmo": algoritmo, "cenario": cenario, "tarefas": tarefas, "cpus": cpus,
+                                 **medicao}
+                    resultados.append(resultado)
+                    imprimir_resultado(resultado)
+
+                os.remove(arquivo)
+
+    return resultados
+
+
+def imprimir_resultado(r: dict):
+    '''
+        Imprime uma linha da tabela de resultados.
+    '''
+
+    print(f"{r['algoritmo']:<7} {r['cenario']:<12} {r['tarefas']:>9} {r['clocks']:>10} {r['maior_fila']:>10} "
+          f"{r['decisoes_por_s']:>13.0f} {r['tempo_por_clock_us']:>11.2f} {r['pico_memoria_kb'] / 1024:>10.1f}")
+
+
+def comparar_com_referencia(resultados: list[dict], arquivo_referencia: str):
+    '''
+        Compara decisões/s com um resultado salvo anteriormente.
+
+        Imprime, para cada caso presente nos dois arquivos, a razão entre a
+        vazão atual e a de referência (> 1 indica melhora).
+    '''
+
+    with open(arquivo_referencia, "r") as arq:
+        referencia = {(r["algoritmo"], r["cenario"], r["tarefas"], r["cpus"]): r
+                      for r in json.load(arq)["resultados"]}
+
+    print(f"\nComparação com {arquivo_referencia} (decisões/s atual / referência):")
+
+    for r in resultados:
+        anterior = referencia.get((r["algoritmo"], r["cenario"], r["tarefas"], r["cpus"]))
+
+        if anterior and anterior["decisoes_por_s"]:
+            razao = r["decisoes_por_s"] / anterior["decisoes_por_s"]
+            print(f"{r['algoritmo']:<7} {r['cenario']:<12} {r['tarefas']:>9} {razao:>8.2f}x")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de escalonamento com cargas sintéticas")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS),
+                        help="quantidades de tarefas das cargas geradas")
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS),
+                        help="cenários de chegada, duração e prioridade")
+    parser.add_argument("--algoritmos", nargs="+", choices=ALGORITMOS, default=list(ALGORITMOS),
+                        help="algoritmos medidos")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="quantidade de núcleos simulados")
+    parser.add_argument("--semente", type=int, default=0,
+                        help="semente do gerador de cargas")
+    parser.add_argument("--binario", action="store_true",
+                        help="converte as cargas para o formato binário indexado antes das execuções")
+    parser.add_argument("--saida", default="benchmark_resultados.json",
+                        help="arquivo JSON com os resultados")
+    parser.add_argument("--referencia", default=None,
+                        help="arquivo JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+
+    print(f"{'Alg.':<7} {'Cenário':<12} {'Tarefas':>9} {'Clocks':>10} {'Fila máx.':>10} "
+          f"{'Decisões/s':>13} {'us/clock':>11} {'Pico (MB)':>10}")
+
+    resultados = executar_benchmark(args.tamanhos, args.cenarios, args.algoritmos, args.cpus, args.semente,
+                                    args.binario)
+
+    with open(args.saida, "w") as arq:
+        json.dump({
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semente": args.semente,
+            "binario": args.binario,
+            "resultados": resultados,
+        }, arq, indent=2)
+
+    print(f"\nResultados salvos em {args.saida}")
+
+    if args.referencia:
+        comparar_com_referencia(resultados, args.referencia)
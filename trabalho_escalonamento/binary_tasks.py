@@ -0,0 +1,222 @@
+from task_reader import SortedTaskReader, external_sort
+from array import array
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+# Identificação do formato binário de tarefas
+MAGIC = b"TSKB"
+VERSAO = 1
+
+# Cabeçalho: magic, versão, largura do ID, quantidade de tarefas,
+# quantidade de entradas do índice e posição do índice no arquivo
+CABECALHO = struct.Struct("<4sHHQQQ")
+
+# Entrada do índice: tempo de ingresso, primeira tarefa do clock e quantidade
+ENTRADA_INDICE = struct.Struct("<qqq")
+
+
+def formato_registro(largura_id: int) -> struct.Struct:
+    '''
+        Registro de largura fixa de uma tarefa: ID (bytes completados com
+        zeros), tempo de ingresso, duração prevista e prioridade.
+    '''
+
+    return struct.Struct(f"<{largura_id}sqqq")
+
+
+def is_binary_task_file(task_file) -> bool:
+    '''
+        Indica se o arquivo está no formato binário de tarefas.
+    '''
+
+    with open(task_file, 'rb') as arq:
+        return arq.read(len(MAGIC)) == MAGIC
+
+
+def convert_task_file(arquivo_texto, arquivo_binario, ordenar: bool = False, largura_id: int | None = None):
+    '''
+        Converte um arquivo de tarefas texto (id;tempo_ingresso;duracao_prevista;prioridade)
+        para o formato binário.
+
+        Layout do arquivo binário:
+        1. Cabeçalho (CABECALHO)
+        2. Registros de largura fixa, em ordem de tempo de ingresso
+        3. Índice com uma entrada por clock com chegadas (ENTRADA_INDICE)
+
+        O texto é lido em streaming (ordenado antes, com *ordenar*), e o
+        índice é mantido em memória como array de inteiros. Sem
+        *largura_id*, uma primeira passada calcula o maior ID do arquivo.
+        Retorna a quantidade de tarefas convertidas.
+    '''
+
+    arquivo_ordenado = external_sort(arquivo_texto) if ordenar else arquivo_texto
+
+    try:
+        if largura_id is None:
+            largura_id = max((len(dados[0].encode('utf-8'))
+                              for _, lote in SortedTaskReader(arquivo_ordenado).batches() for dados in lote),
+                             default=1)
+
+        registro = formato_registro(largura_id)
+        indice = array('q')
+        total = 0
+
+        with open(arquivo_binario, 'wb') as destino:
+            destino.write(CABECALHO.pack(MAGIC, VERSAO, largura_id, 0, 0, 0))
+
+            for tempo, lote in SortedTaskReader(arquivo_ordenado).batches():
+                indice.extend((tempo, total, len(lote)))
+
+                for dados in lote:
+                    id_tarefa = dados[0].encode('utf-8')
+
+                    if len(id_tarefa) > largura_id:
+                        raise ValueError(f"ID {dados[0]} maior que a largura de {largura_id} bytes")
+
+                    destino.write(registro.pack(id_tarefa, int(dados[1]), int(dados[2]), int(dados[3])))
+
+                total += len(lote)
+
+            # Índice em little-endian, como os registros
+            posicao_indice = destino.tell()
+            if sys.byteorder == "big":
+                indice.byteswap()
+            indice.tofile(destino)
+
+            destino.seek(0)
+            destino.write(CABECALHO.pack(MAGIC, VERSAO, largura_id, total, len(indice) // 3, posicao_indice))
+
+    finally:
+        if ordenar:
+            os.remove(arquivo_ordenado)
+
+    return total
+
+
+class BinaryTaskReader:
+    '''
+        Leitura de um arquivo de tarefas binário via memória mapeada (mmap).
+
+        Não há leitura nem conversão do arquivo na abertura: o índice é
+        percorrido em ordem, à medida que o clock avança, e as tarefas de
+        cada clock são desempacotadas diretamente dos registros de largura
+        fixa (struct), sem split nem conversão de texto.
+
+        Oferece a mesma interface de SortedTaskReader (get, pop, del, in e
+        bool), com o tempo como string. Cada tarefa é a tupla
+        (id, tempo_ingresso, duracao_prevista, prioridade), aceita por
+        task_to_dict.
+    '''
+
+    def __init__(self, task_file):
+        self.task_file = task_file
+        self._arquivo = open(task_file, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, versao, largura_id, self.total_tarefas, self._entradas, self._posicao_indice = \
+            CABECALHO.unpack_from(self._mapa)
+
+        if magic != MAGIC or versao != VERSAO:
+            raise ValueError(f"Arquivo {task_file} não está no formato binário de tarefas (versão {VERSAO})")
+
+        self._registro = formato_registro(largura_id)
+
+        # Próxima entrada do índice e lote já desempacotado dessa entrada
+        self._entrada = 0
+        self._lote = None
+
+
+    def _entrada_atual(self):
+        '''
+            Retorna (tempo, primeira_tarefa, quantidade) da próxima entrada do índice.
+        '''
+
+        if self._entrada >= self._entradas:
+            return None
+
+        return ENTRADA_INDICE.unpack_from(self._mapa, self._posicao_indice + self._entrada * ENTRADA_INDICE.size)
+
+
+    def get(self, clock, default=None):
+        '''
+            Retorna as tarefas com ingresso em *clock*, sem consumi-las.
+        '''
+
+        entrada = self._entrada_atual()
+
+        if entrada is None or entrada[0] != int(clock):
+            return default
+
+        if self._lote is None:
+            _, primeira, quantidade = entrada
+            inicio = CABECALHO.size + primeira * self._registro.size
+            fim = inicio + quantidade * self._registro.size
+
+            self._lote = [(id_tarefa.rstrip(b"\0").decode('utf-8'), tempo, duracao, prioridade)
+                          for id_tarefa, tempo, duracao, prioridade
+                          in self._registro.iter_unpack(self._mapa[inicio:fim])]
+
+        return self._lote
+
+
+    def pop(self, clock, default=None):
+        '''
+            Retorna e consome as tarefas com ingresso em *clock*.
+        '''
+
+        lote = self.get(clock)
+
+        if lote is None:
+            return default
+
+        self._entrada += 1
+        self._lote = None
+        return lote
+
+
+    def __contains__(self, clock):
+        return self.get(clock) is not None
+
+
+    def __delitem__(self, clock):
+        if self.pop(clock) is None:
+            raise KeyError(clock)
+
+
+    def __bool__(self):
+        '''
+            Indica se ainda há tarefas a emitir.
+        '''
+
+        return self._entrada < self._entradas
+
+
+    def close(self):
+        '''
+            Libera o mapeamento e fecha o arquivo.
+        '''
+
+        if self._arquivo is None:
+            return
+
+        self._mapa.close()
+        self._arquivo.close()
+        self._arquivo = None
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Converte um arquivo de tarefas texto para o formato binário indexado")
+    parser.add_argument("arquivo_tarefas", help="arquivo de entrada (id;tempo_ingresso;duracao_prevista;prioridade)")
+    parser.add_argument("arquivo_binario", help="arquivo binário gerado")
+    parser.add_argument("--ordenar", action="store_true",
+                        help="ordena o arquivo por tempo de ingresso antes da conversão")
+    parser.add_argument("--largura-id", type=int, default=None,
+                        help="bytes reservados para o ID de cada tarefa (padrão: maior ID do arquivo)")
+    args = parser.parse_args()
+
+    total = convert_task_file(args.arquivo_tarefas, args.arquivo_binario, args.ordenar, args.largura_id)
+    print(f"{total} tarefas convertidas para {args.arquivo_binario} ({os.path.getsize(args.arquivo_binario)} bytes)")
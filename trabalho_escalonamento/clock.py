@@ -1,15 +1,32 @@
-import time
 from baseServer import BaseServer
+from log_config import configure_logging
+import argparse
+import time
+import logging
+
+logger = logging.getLogger(__name__)
 
 class CLOCK(BaseServer):
     '''
         Classe responsável por gerenciar o clock da CPU.
     
         O clock atua como coordenador temporal, enviando pulsos sincronizados
-        para o emissor de tarefas e o escalonador a cada 100ms.
+        para o emissor de tarefas e o escalonador a cada tick_period segundos
+        (100ms por padrão). Com tick_period = 0 o clock avança o mais rápido
+        possível, permitindo medir a taxa máxima de ticks do sistema.
+
+        Cada tick é uma barreira confirmada: o pulso só é enviado ao escalonador
+        depois que o emissor confirma a entrega das chegadas do tick, e o clock
+        só avança depois que o escalonador confirma o processamento do tick.
+        Pulsos sem confirmação em ack_timeout segundos são reenviados.
     '''
     
-    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int):
+    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int,
+                 tick_period: float = 0.1, ack_timeout: float = 1.0):
+        '''
+            *tick_period* (float): duração mínima de cada tick, em segundos (0 = sem espera)
+            *ack_timeout* (float): espera máxima por uma confirmação antes de reenviar o pulso
+        '''
 
         # Inicializar classe pai com informações do servidor
         super().__init__(host, clock_port, "clock")
@@ -23,6 +40,15 @@ class CLOCK(BaseServer):
         self.clock_started = False                  # Flag de controle: clock ativo/inativo
         self.running = True                         # Flag de controle: sistema rodando/parado
 
+        # Ritmo do clock
+        self.tick_period: float = tick_period
+        self.ack_timeout: float = ack_timeout
+        self.start_time = None                      # Instante do primeiro tick (medição da taxa)
+
+        # Último tick confirmado por cada componente
+        self.emitter_ack = None
+        self.scheduler_ack = None
+
 
     def process_message(self, message):
         '''
@@ -30,15 +56,23 @@ class CLOCK(BaseServer):
             
             Processa os seguintes comandos:
             - "EMISSOR: INICIAR CLOCK": Ativa o clock (clock_started = True)
+            - "EMISSOR: TICK {n} ENTREGUE": Chegadas do tick n entregues ao escalonador
+            - "ESCALONADOR: TICK {n} CONCLUIDO": Tick n processado pelo escalonador
             - "ESCALONADOR: ENCERRADO": Para o sistema (running = False)
         '''
         
-        print(f"Mensagem recebida: {message}")
+        logger.debug("Mensagem recebida: %s", message)
 
         # Processar mensagem
         if message == "EMISSOR: INICIAR CLOCK":
             self.clock_started = True
-            print("CLOCK INICIADO! \n")
+            logger.info("CLOCK INICIADO! \n")
+
+        elif message.startswith("EMISSOR: TICK "):
+            self.emitter_ack = int(message.split()[2])
+
+        elif message.startswith("ESCALONADOR: TICK "):
+            self.scheduler_ack = int(message.split()[2])
 
         elif message == "ESCALONADOR: ENCERRADO":
             self.running = False
@@ -73,20 +107,45 @@ class CLOCK(BaseServer):
         self.send_message(self.host, self.scheduler_port, message)
 
 
+    def send_pulse(self, enviar, confirmado):
+        '''
+            Envia um pulso e aguarda sua confirmação.
+
+            *enviar* (callable): envia o pulso do tick atual
+            *confirmado* (callable): indica se a confirmação do tick já chegou
+
+            Processa mensagens enquanto espera, acordando assim que a confirmação
+            chega. Reenvia o pulso se não houver confirmação em ack_timeout segundos
+            (ex.: componente que ainda não estava escutando).
+        '''
+
+        enviar()
+        limite = time.monotonic() + self.ack_timeout
+
+        while self.running and not confirmado():
+            restante = limite - time.monotonic()
+
+            if restante <= 0:
+                enviar()
+                limite = time.monotonic() + self.ack_timeout
+                continue
+
+            self.check_messages(restante)
+
+
     def clock_tick(self):
         '''
-            Loop principal do clock - gera pulsos a cada 100ms.
+            Loop principal do clock - gera um pulso a cada tick_period segundos.
             
             Executa o ciclo temporal do sistema:
             1. Verifica se o clock foi iniciado
-            2. Envia pulso para o emissor de tarefas
-            3. Aguarda 5ms (tempo para inserção de tarefas)
-            4. Envia pulso para o escalonador
-            5. Incrementa o contador de clock
-            6. Aguarda 100ms (próximo ciclo)
-            7. Verifica mensagens de controle
+            2. Envia pulso para o emissor e aguarda a entrega das chegadas do tick
+            3. Envia pulso para o escalonador e aguarda o processamento do tick
+            4. Incrementa o contador de clock
+            5. Aguarda o fim do tick (próximo ciclo), atendendo mensagens de controle
             
-            O loop continua até que running seja False.      
+            O loop continua até que running seja False. Ao final, informa a
+            taxa de ticks por segundo alcançada.
         '''
 
         try:
@@ -95,39 +154,59 @@ class CLOCK(BaseServer):
 
                 # Se clock iniciado, faz o trabalho
                 if self.clock_started:                    
-                    print(f"Clock atual: {self.current_clock}")
+                    logger.debug("Clock atual: %s", self.current_clock)
 
-                    # Comunicação com o Emissor
-                    self.communication_emitter()
+                    inicio_tick = time.monotonic()
 
-                    # Tempo para o EMISSOR DE TAREFAS inserir as tarefas antes do 
-                    # ESCALONADOR tentar escalona-lás
-                    time.sleep(0.005)
+                    if self.start_time is None:
+                        self.start_time = inicio_tick
+
+                    # Comunicação com o Emissor: as tarefas do tick precisam ser
+                    # inseridas antes do ESCALONADOR tentar escalona-lás
+                    self.send_pulse(self.communication_emitter,
+                                    lambda: self.emitter_ack == self.current_clock)
 
                     # Comunicação com o Escalonador
-                    self.communication_scheduler()
+                    self.send_pulse(self.communication_scheduler,
+                                    lambda: self.scheduler_ack == self.current_clock)
 
                     # Incrementa o clock 
                     self.current_clock += 1
 
-                    # Tempo de delay para o avanço da linha do tempo
-                    time.sleep(0.1)
+                    # Tempo de delay para o avanço da linha do tempo,
+                    # atendendo mensagens de controle que chegarem
+                    if self.tick_period > 0:
+                        self.wait(inicio_tick + self.tick_period - time.monotonic())
+                    else:
+                        self.check_messages(0)
 
                 else:
-                    # Evita uso excessivo de CPU
-                    time.sleep(0.01)
-                    
-                # Verifica mensagens RAPIDAMENTE
-                self.check_messages()
+                    # Dorme até o emissor pedir o início do clock
+                    self.check_messages(1.0)
 
             self.close_server()
-            print("CLOCK ENCERRADO POR COMPLETO!")
+            self.report_tick_rate()
+            logger.info("CLOCK ENCERRADO POR COMPLETO!")
 
         except Exception as e:
-            print(f"Erro no clock_tick: {e}")
+            logger.error("Erro no clock_tick: %s", e)
             self.close_server()
 
 
+    def report_tick_rate(self):
+        '''
+            Informa quantos ticks foram gerados e a taxa média em ticks por segundo.
+        '''
+
+        if self.start_time is None:
+            return
+
+        duracao = time.monotonic() - self.start_time
+
+        if duracao > 0:
+            logger.info("%d ticks em %.3fs (%.1f ticks/s)", self.current_clock, duracao, self.current_clock / duracao)
+
+
     def start(self):
         '''
             Inicia o sistema de clock.
@@ -147,17 +226,28 @@ class CLOCK(BaseServer):
             self.clock_tick()
             
         except KeyboardInterrupt:
-            print("Interrompido pelo usuário")
+            logger.warning("Interrompido pelo usuário")
             self.running = False
             self.close_server()
 
         except Exception as e:
-            print(f"Erro geral: {e}")
+            logger.error("Erro geral: %s", e)
             self.close_server()
 
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Clock do sistema de escalonamento")
+    parser.add_argument("--periodo", type=float, default=0.1,
+                        help="duração de cada tick em segundos (0 = o mais rápido possível)")
+    parser.add_argument("--timeout-confirmacao", type=float, default=1.0,
+                        help="espera, em segundos, por uma confirmação de tick antes de reenviar o pulso")
+    parser.add_argument("--debug", action="store_true",
+                        help="exibe o detalhe de cada mensagem e de cada clock (padrão: apenas o resumo)")
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
+
     # Portas de comunicação
     clock_port = 4000
     emitter_port = 4001
@@ -166,5 +256,5 @@ if __name__ == "__main__":
     # Host local
     host = "localhost"
 
-    clock = CLOCK(host, clock_port, emitter_port, scheduler_port)
-    clock.start()
\ No newline at end of file
+    clock = CLOCK(host, clock_port, emitter_port, scheduler_port, args.periodo, args.timeout_confirmacao)
+    clock.start()
@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor
+from simulador import SIMULADOR
+from file_writer import TIMELINE_FORMATS
+from output_reader import iter_statistics
+import argparse
+import logging
+import os
+import time
+
+# Algoritmos disponíveis no ESCALONADOR
+ALGORITMOS = ("fcfs", "rr", "mlfq", "cfs", "sjf", "srtf", "prioc", "priop", "priod")
+
+# Pasta onde cada algoritmo recebe seu próprio diretório de saídas
+PASTA_COMPARACAO = "comparacao_saidas"
+
+
+def silenciar_logs():
+    '''
+        Inicializador dos processos trabalhadores: o log do escalonador fica
+        restrito a avisos e erros.
+    '''
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def executar_algoritmo(arquivo: str, algoritmo: str, pasta: str, cpus: int = 1, timeline_format: str = "legado"):
+    '''
+        Executa a simulação de um algoritmo em um processo trabalhador.
+
+        A execução acontece dentro de *pasta* (arquivo_saidas/ é criado ali),
+        de forma que execuções simultâneas não compartilham arquivos. Apenas
+        avisos e erros do escalonador são registrados (ver silenciar_logs) e
+        o diagrama de Gantt não é gerado.
+
+        Retorna um dicionário com as médias de turnaround e waiting time
+        (as mesmas do arquivo de saída), as trocas de contexto, a quantidade
+        de clocks e o tempo de parede da simulação em segundos.
+    '''
+
+    os.makedirs(pasta, exist_ok=True)
+    os.chdir(pasta)
+
+    simulador = SIMULADOR(arquivo, algoritmo, timeline_format=timeline_format, cpus=cpus)
+    simulador.gerar_grafico = False
+
+    inicio = time.perf_counter()
+    simulador.start()
+    duracao = time.perf_counter() - inicio
+
+    *_, medias = iter_statistics(simulador.file_writer.output_file)
+
+    return {
+        "algoritmo": algoritmo,
+        "media_turnaround": float(medias[0]),
+        "media_waiting": float(medias[1]),
+        "trocas_de_contexto": simulador.algorithms[algoritmo].trocas_de_contexto,
+        "clocks": simulador.virtual_clock + 1,
+        "tempo": duracao,
+    }
+
+
+def comparar(arquivo: str, algoritmos=ALGORITMOS, processos: int | None = None, cpus: int = 1,
+             timeline_format: str = "legado"):
+    '''
+        Executa os *algoritmos* sobre o mesmo arquivo de tarefas em paralelo.
+
+        Cada algoritmo roda em um processo do pool (no máximo *processos*,
+        por padrão um por CPU), com saídas em comparacao_saidas/<algoritmo>/.
+        Retorna os resultados de executar_algoritmo() na ordem de *algoritmos*.
+    '''
+
+    arquivo = os.path.abspath(arquivo)
+    pasta_base = os.path.abspath(PASTA_COMPARACAO)
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=silenciar_logs) as pool:
+        execucoes = [pool.submit(executar_algoritmo, arquivo, algoritmo, os.path.join(pasta_base, algoritmo),
+                                 cpus, timeline_format)
+                     for algoritmo in algoritmos]
+
+        return [execucao.result() for execucao in execucoes]
+
+
+def imprimir_tabela(resultados: list[dict]):
+    '''
+        Imprime a tabela comparativa dos algoritmos.
+    '''
+
+    print(f"{'Algoritmo':<10} {'Turnaround':>11} {'Waiting':>9} {'Trocas':>8} {'Clocks':>8} {'Tempo (s)':>10}")
+
+    for r in resultados:
+        print(f"{r['algoritmo']:<10} {r['media_turnaround']:>11.1f} {r['media_waiting']:>9.1f} "
+              f"{r['trocas_de_contexto']:>8} {r['clocks']:>8} {r['tempo']:>10.3f}")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Compara algoritmos de escalonamento em paralelo")
+    parser.add_argument("arquivo_tarefas", help="arquivo de entrada (id;tempo_ingresso;duracao_prevista;prioridade)")
+    parser.add_argument("algoritmos", nargs="*",
+                        help="algoritmos a comparar (padrão: todos): " + ", ".join(ALGORITMOS))
+    parser.add_argument("--processos", type=int, default=None,
+                        help="quantidade de processos trabalhadores (padrão: um por CPU)")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="quantidade de núcleos simulados em cada execução")
+    parser.add_argument("--formato", choices=TIMELINE_FORMATS, default="legado",
+                        help="formato do timeline nos arquivos de saída")
+    args = parser.parse_args()
+
+    invalidos = [algoritmo for algoritmo in args.algoritmos if algoritmo not in ALGORITMOS]
+    if invalidos:
+        parser.error(f"algoritmo(s) inválido(s): {', '.join(invalidos)}")
+
+    inicio = time.perf_counter()
+    resultados = comparar(args.arquivo_tarefas, args.algoritmos or ALGORITMOS, args.processos, args.cpus, args.formato)
+    duracao = time.perf_counter() - inicio
+
+    imprimir_tabela(resultados)
+    print(f"\nTempo total: {duracao:.3f}s (saídas em {PASTA_COMPARACAO}/)")
@@ -1,31 +1,209 @@
-import matplotlib
-matplotlib.use('Agg')  # Backend para salvar arquivos
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+import glob
+import logging
+import math
 import os
+import re
+import subprocess
+import sys
+from log_config import configure_logging
+from output_reader import iter_statistics, iter_timeline
+
+logger = logging.getLogger(__name__)
+
+# Pasta dos arquivos de saída e arquivos auxiliares que não têm gráfico próprio
+PASTA_SAIDAS = "arquivo_saidas"
+ARQUIVO_AUXILIAR = re.compile(r"_(cpu\d+|utilizacao|estatisticas)\.txt$")
+
+CORES = ["red", "blue", "green", "purple", "yellow", "orange", "brown"]
+
+# Colunas de tempo distinguíveis no gráfico (largura útil da figura em pixels,
+# a 300 dpi); acima disso, os segmentos são agregados em colunas
+MAX_COLUNAS = 3000
+
+# Quantidade máxima de rótulos nos eixos e de threads na legenda
+MAX_ROTULOS_X = 20
+MAX_ROTULOS_Y = 50
+MAX_LEGENDA = 30
+
+
+def _pyplot():
+    '''
+        Carrega o matplotlib (backend Agg, para salvar arquivos) sob demanda.
+
+        matplotlib e numpy são importados apenas quando um gráfico é de fato
+        gerado, de forma que importar este módulo (como fazem o escalonador e
+        os algoritmos) não pesa na inicialização.
+    '''
+
+    import matplotlib
+    matplotlib.use('Agg')  # Backend para salvar arquivos
+    import matplotlib.pyplot as plt
+
+    return plt
 
 
 def abrir_arquivo(nome_arquivo):
     '''
-        Lê o arquivo de saida com os dados das tarefas escalonadas
+        Lê as estatísticas do arquivo de saida com os dados das tarefas escalonadas
+
+        Retorna a lista de linhas das threads (ID;ingresso;finalização;...),
+        sem a linha de médias. O timeline é lido à parte, em streaming.
     '''
-    
-    informacao = []
-    matriz = []
-    arq = open(nome_arquivo, 'r')
-    informacao = arq.readlines()
-    arq.close()
 
-    for c in informacao:
-        matriz.append(c[:-1].split(";"))
+    return list(iter_statistics(nome_arquivo))[:-1]
+
+
+def _segmentos_por_faixa(segmentos):
+    '''
+        Agrupa os segmentos de execução em uma única passada.
+
+        *segmentos* é um iterável de (faixa, thread, inicio, duracao).
+        Retorna o dicionário {(faixa, thread): [(inicio, duracao), ...]}, na
+        ordem da primeira execução de cada par, e o maior clock alcançado.
+    '''
+
+    por_faixa = {}
+    tempo_maximo = 0
+
+    for faixa, thread, inicio, duracao in segmentos:
+        lista = por_faixa.get((faixa, thread))
+        if lista is None:
+            lista = por_faixa[(faixa, thread)] = []
+
+        lista.append((inicio, duracao))
+        tempo_maximo = max(tempo_maximo, inicio + duracao)
+
+    return por_faixa, tempo_maximo
+
+
+def _agregar(segmentos, largura_coluna: int):
+    '''
+        Reduz os segmentos à resolução do gráfico.
+
+        Cada segmento é expandido para as colunas de *largura_coluna* clocks
+        que ele toca, e colunas contíguas são unidas. Uma thread que executou
+        em qualquer ponto de uma coluna continua visível nela, e a quantidade
+        de segmentos fica limitada à quantidade de colunas.
+    '''
+
+    if largura_coluna <= 1:
+        return segmentos
+
+    agregados = []
+
+    for inicio, duracao in segmentos:
+        coluna_inicio = inicio // largura_coluna * largura_coluna
+        coluna_fim = -(-(inicio + duracao) // largura_coluna) * largura_coluna
+
+        if agregados and agregados[-1][0] + agregados[-1][1] >= coluna_inicio:
+            ultimo_inicio = agregados[-1][0]
+            agregados[-1] = (ultimo_inicio, max(agregados[-1][1], coluna_fim - ultimo_inicio))
+        else:
+            agregados.append((coluna_inicio, coluna_fim - coluna_inicio))
+
+    return agregados
+
+
+def _retangulos(inicios, larguras, posicoes_y, **estilo):
+    '''
+        Cria uma única coleção com todos os retângulos (barras horizontais de
+        altura 0.8 centradas em *posicoes_y*), desenhada em uma só chamada.
+    '''
+
+    import numpy as np
+    from matplotlib.collections import PolyCollection
+
+    x0 = np.asarray(inicios, dtype=float)
+    x1 = x0 + np.asarray(larguras, dtype=float)
+    y0 = np.asarray(posicoes_y, dtype=float) - 0.4
+    y1 = y0 + 0.8
+
+    vertices = np.stack([np.column_stack(ponto) for ponto in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))], axis=1)
+    return PolyCollection(vertices, **estilo)
+
 
-    return matriz
+def _borda(detalhado: bool) -> str:
+    '''
+        Cor da borda dos retângulos: sem borda quando as barras ficam menores
+        que a resolução do gráfico, para que a borda não encubra as cores.
+    '''
+
+    return 'black' if detalhado else 'none'
+
+
+def _desenhar_segmentos(ax, por_faixa, posicoes, tempo_maximo):
+    '''
+        Desenha todos os segmentos de execução em uma única coleção.
+
+        *posicoes* mapeia cada faixa para sua posição no eixo Y. Cada thread
+        recebe uma cor fixa, na ordem da primeira execução. Com mais de
+        MAX_COLUNAS clocks, os segmentos são agregados (ver _agregar); nesse
+        caso, ou com mais de MAX_ROTULOS_Y faixas, são desenhados sem borda.
+        Retorna o dicionário {thread: cor}.
+    '''
+
+    largura_coluna = max(1, math.ceil(tempo_maximo / MAX_COLUNAS))
+    cor_da_thread = {}
+    inicios, larguras, posicoes_y, cores = [], [], [], []
+
+    for (faixa, thread), segmentos in por_faixa.items():
+        if thread not in cor_da_thread:
+            cor_da_thread[thread] = CORES[len(cor_da_thread) % len(CORES)]
+
+        for inicio, duracao in _agregar(segmentos, largura_coluna):
+            inicios.append(inicio)
+            larguras.append(duracao)
+            posicoes_y.append(posicoes[faixa])
+            cores.append(cor_da_thread[thread])
+
+    if inicios:
+        ax.add_collection(_retangulos(inicios, larguras, posicoes_y, facecolors=cores,
+                                      edgecolors=_borda(largura_coluna == 1 and len(posicoes) <= MAX_ROTULOS_Y)),
+                          autolim=False)
+
+    return cor_da_thread
+
+
+def _configurar_eixos(ax, rotulos_y, tempo_maximo, cor_da_thread):
+    '''
+        Ajusta limites, rótulos, grid e legenda à escala do gráfico.
+
+        O eixo X recebe no máximo MAX_ROTULOS_X marcações inteiras (todos os
+        clocks em execuções curtas), o eixo Y mostra um a cada N rótulos
+        quando há mais de MAX_ROTULOS_Y faixas, e a legenda só é exibida até
+        MAX_LEGENDA threads.
+    '''
+
+    from matplotlib.patches import Patch
+    from matplotlib.ticker import MaxNLocator
+
+    passo_y = max(1, math.ceil(len(rotulos_y) / MAX_ROTULOS_Y))
+    ax.set_yticks(range(0, len(rotulos_y), passo_y), rotulos_y[::passo_y])
+    ax.set_ylim(-0.6, len(rotulos_y) - 0.4)
+
+    ax.set_xlim(0, max(tempo_maximo, 1))
+    ax.xaxis.set_major_locator(MaxNLocator(nbins=MAX_ROTULOS_X, integer=True))
+
+    # Adicionar grid para melhor visualização
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+    ax.set_xlabel('Tempo (Clock)')
+
+    # Legenda ordenada pelos labels (t0, t1, t2, ...)
+    if 0 < len(cor_da_thread) <= MAX_LEGENDA:
+        ax.legend(handles=[Patch(facecolor=cor_da_thread[thread], edgecolor='black', label=thread)
+                           for thread in sorted(cor_da_thread)])
 
 
 def analisar_matriz(matriz, nome_arquivo):
     '''
         Analisa a matriz de dados que representa os dados presentes no arquivo de saída.
         Gera a imagem de um gráfico de barras em relação aos dados das tarefas escalonadas
+
+        *matriz* contém as linhas de estatísticas das threads; os segmentos de
+        execução são percorridos diretamente do arquivo (formato legado ou RLE).
+        Os segmentos são agrupados por thread em uma passada e desenhados
+        todos em uma única coleção (ver _desenhar_segmentos).
     '''
     
     categorias = []
@@ -33,97 +211,186 @@ def analisar_matriz(matriz, nome_arquivo):
     largura = []
     cor = "white"
     
-    for i in range(1, len(matriz)-1):
-        categorias.append(matriz[i][0])
-        inicio.append(int(matriz[i][1]))
-        largura.append(int(matriz[i][2]) - int(matriz[i][1]))
-    
-    plt.figure(figsize=(12, 8))
-    y = np.arange(len(categorias))
-    plt.barh(y, largura, left=inicio, color=cor, edgecolor='black', alpha=0.3)
-    
-    cores = ["red", "blue", "green", "purple", "yellow", "orange", "brown"]
-    sequencia = []
-    labels_adicionados = set()  # Para evitar labels duplicados
-    
-    # Criar um mapeamento de thread para índice de cor
-    threads_unicas = []
-    for thread in matriz[0]:
-        if thread not in threads_unicas:
-            threads_unicas.append(thread)
+    for linha in matriz:
+        categorias.append(linha[0])
+        inicio.append(int(linha[1]))
+        largura.append(int(linha[2]) - int(linha[1]))
     
-    for i in range(len(matriz[0])- 1):
-        thread = matriz[0][i]
-        
-        if len(sequencia) == 0:
-            inicio_seq = i
-            sequencia.append(thread)
-            index_categoria = categorias.index(thread)
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.add_collection(_retangulos(inicio, largura, range(len(categorias)),
+                                  facecolors=cor, edgecolors=_borda(len(categorias) <= MAX_ROTULOS_Y), alpha=0.3),
+                      autolim=False)
 
-        elif sequencia[-1] == thread:
-            sequencia.append(thread)
+    # Posição de cada thread no eixo Y
+    posicoes = {thread: indice for indice, thread in enumerate(categorias)}
 
-        else:
-            # Usar o índice correto da thread para a cor
-            indice_cor = threads_unicas.index(sequencia[0])
-            
-            # Adicionar label apenas uma vez por thread
-            label = sequencia[0] if sequencia[0] not in labels_adicionados else ""
-            if sequencia[0] not in labels_adicionados:
-                labels_adicionados.add(sequencia[0])
-            
-            plt.barh(y[index_categoria], len(sequencia), left=inicio_seq, 
-                    color=cores[indice_cor % len(cores)], edgecolor='black', label=label)
-            
-            inicio_seq = i
-            index_categoria = categorias.index(thread)
-            sequencia = []
-            sequencia.append(thread)
-    
-    # Processar a última sequência
-    if sequencia:
-        indice_cor = threads_unicas.index(sequencia[0])
-        label = sequencia[0] if sequencia[0] not in labels_adicionados else ""
-        plt.barh(y[index_categoria], len(sequencia), left=inicio_seq, 
-                color=cores[indice_cor % len(cores)], edgecolor='black', label=label)
-    
-    plt.yticks(y, categorias)
-    
-    # Configurar eixo X com mais detalhamento
-    tempo_maximo = max([int(matriz[i][2]) for i in range(1, len(matriz)-1)])
-    
-    # Mostrar todos os números inteiros
-    plt.xticks(range(0, tempo_maximo + 1, 1))
-    
-    # Adicionar grid para melhor visualização
-    plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-    
-    plt.xlabel('Tempo (Clock)')
-    plt.title('Execução de Tarefas - Diagrama de Gantt')
-    
-    # Ordenar a legenda para ficar na ordem correta (t0, t1, t2, ...)
-    handles, labels = plt.gca().get_legend_handles_labels()
-    
-    # Ordenar pelos labels
-    sorted_pairs = sorted(zip(labels, handles))
-    sorted_labels, sorted_handles = zip(*sorted_pairs)
-    plt.legend(sorted_handles, sorted_labels)
-    
-    plt.tight_layout()
+    por_thread, tempo_execucao = _segmentos_por_faixa(
+        (thread, thread, inicio_seq, duracao) for thread, inicio_seq, duracao in iter_timeline(nome_arquivo))
+    cor_da_thread = _desenhar_segmentos(ax, por_thread, posicoes, tempo_execucao)
+
+    tempo_maximo = max([int(linha[2]) for linha in matriz], default=tempo_execucao)
+    _configurar_eixos(ax, categorias, tempo_maximo, cor_da_thread)
+
+    ax.set_title('Execução de Tarefas - Diagrama de Gantt')
     
+    fig.tight_layout()
+    salvar_grafico(nome_arquivo)
+    plt.close(fig)
+
+
+def salvar_grafico(nome_arquivo):
+    '''
+        Salva a figura atual em grafico_saidas/, com o nome base do arquivo de saída.
+    '''
+
     # Criar pasta se não existir
     pasta_saida = "grafico_saidas"
     if not os.path.exists(pasta_saida):
         os.makedirs(pasta_saida)
-        print(f"Pasta '{pasta_saida}' criada.")
-    
+        logger.info("Pasta '%s' criada.", pasta_saida)
+
     # Extrair nome do arquivo sem extensão e caminho
     nome_base = os.path.splitext(os.path.basename(nome_arquivo))[0]
     caminho_saida = os.path.join(pasta_saida, f"{nome_base}.png")
-    
+
     # Salva o gráfico
-    plt.savefig(caminho_saida, dpi=300, bbox_inches='tight')
-    
+    _pyplot().savefig(caminho_saida, dpi=300, bbox_inches='tight')
+
+
+def analisar_nucleos(arquivos_nucleos, nome_arquivo):
+    '''
+        Gera o diagrama de Gantt do modo multi-CPU, com uma faixa por núcleo.
+
+        *arquivos_nucleos* são os timelines de cada núcleo (na ordem dos
+        núcleos), em que a posição de cada segmento é o clock. Cada thread
+        mantém a mesma cor em todos os núcleos, evidenciando as migrações.
+        O gráfico é salvo com o nome base de *nome_arquivo*.
+    '''
+
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    por_nucleo, tempo_maximo = _segmentos_por_faixa(
+        (indice, thread, inicio_seq, duracao)
+        for indice, arquivo in enumerate(arquivos_nucleos)
+        for thread, inicio_seq, duracao in iter_timeline(arquivo))
+
+    posicoes = {indice: indice for indice in range(len(arquivos_nucleos))}
+    cor_da_thread = _desenhar_segmentos(ax, por_nucleo, posicoes, tempo_maximo)
+
+    _configurar_eixos(ax, [f"CPU {indice}" for indice in range(len(arquivos_nucleos))], tempo_maximo, cor_da_thread)
+    ax.set_title('Execução de Tarefas por Núcleo - Diagrama de Gantt')
+
+    fig.tight_layout()
+    salvar_grafico(nome_arquivo)
+    plt.close(fig)
+
+
 def grafico_tarefas_escalonadas(nome_arquivo):
     analisar_matriz(abrir_arquivo(nome_arquivo), nome_arquivo)
-    
\ No newline at end of file
+
+
+def grafico_nucleos(arquivos_nucleos, nome_arquivo):
+    analisar_nucleos(arquivos_nucleos, nome_arquivo)
+    
+
+
+def arquivos_de_nucleos(nome_arquivo):
+    '''
+        Retorna os timelines por núcleo (algoritmo_<nome>_cpuN.txt) ao lado
+        do arquivo de saída, na ordem dos núcleos.
+    '''
+
+    base = os.path.splitext(nome_arquivo)[0]
+    nucleos = {}
+
+    for arquivo in glob.glob(f"{glob.escape(base)}_cpu*.txt"):
+        indice = arquivo[len(base) + len("_cpu"):-len(".txt")]
+        if indice.isdigit():
+            nucleos[int(indice)] = arquivo
+
+    return [nucleos[indice] for indice in sorted(nucleos)]
+
+
+def saidas_principais(pasta: str = PASTA_SAIDAS):
+    '''
+        Lista os arquivos de saída dos algoritmos em *pasta*, sem os arquivos
+        auxiliares (timelines por núcleo, utilização e estatísticas).
+    '''
+
+    return sorted(arquivo for arquivo in glob.glob(os.path.join(pasta, "algoritmo_*.txt"))
+                  if not ARQUIVO_AUXILIAR.search(arquivo))
+
+
+def renderizar(nome_arquivo, arquivos_nucleos=None):
+    '''
+        Gera o diagrama de Gantt de um arquivo de saída já finalizado.
+
+        Com *arquivos_nucleos* (ou, se None, com timelines por núcleo
+        encontrados ao lado do arquivo), gera o gráfico com uma faixa por
+        núcleo. Retorna o nome do arquivo renderizado.
+    '''
+
+    if arquivos_nucleos is None:
+        arquivos_nucleos = arquivos_de_nucleos(nome_arquivo)
+
+    if arquivos_nucleos:
+        grafico_nucleos(arquivos_nucleos, nome_arquivo)
+    else:
+        grafico_tarefas_escalonadas(nome_arquivo)
+
+    return nome_arquivo
+
+
+def renderizar_em_lote(arquivos, processos: int | None = None):
+    '''
+        Renderiza vários arquivos de saída em paralelo, um por processo trabalhador.
+    '''
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for nome_arquivo in pool.map(renderizar, arquivos):
+            logger.info("Gráfico gerado: %s", nome_arquivo)
+
+
+def iniciar_renderizacao(nome_arquivo, arquivos_nucleos=()) -> subprocess.Popen:
+    '''
+        Gera o diagrama de Gantt em um processo separado, em segundo plano.
+
+        O escalonador não espera o fim da renderização: o processo filho lê
+        o arquivo de saída já finalizado (e os timelines por núcleo, se
+        houver) e continua executando após o encerramento do escalonador.
+    '''
+
+    comando = [sys.executable, os.path.abspath(__file__), nome_arquivo, "--nucleos", *arquivos_nucleos]
+    return subprocess.Popen(comando, start_new_session=True)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Gera os diagramas de Gantt de arquivos de saída do escalonador")
+    parser.add_argument("arquivos", nargs="*",
+                        help=f"arquivos de saída (padrão: todos os algoritmos em {PASTA_SAIDAS}/)")
+    parser.add_argument("--nucleos", nargs="*", default=None,
+                        help="timelines por núcleo do arquivo informado (padrão: detectados ao lado do arquivo; "
+                             "sem valores, gráfico de uma CPU)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="quantidade de processos trabalhadores (padrão: número de CPUs)")
+    args = parser.parse_args()
+
+    configure_logging()
+    arquivos = args.arquivos or saidas_principais()
+
+    if args.nucleos is not None:
+        if len(arquivos) != 1:
+            parser.error("--nucleos exige um único arquivo de saída")
+
+        renderizar(arquivos[0], args.nucleos)
+
+    elif len(arquivos) == 1:
+        renderizar(arquivos[0])
+
+    else:
+        renderizar_em_lote(arquivos, args.processos)
@@ -1,6 +1,85 @@
 from baseServer import BaseServer
-import sys
-import time
+from task_reader import open_task_stream
+from binary_tasks import BinaryTaskReader, is_binary_task_file
+from log_config import configure_logging
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def load_tasks_by_time(task_file) -> dict[str, list[list[str]]]:
+    '''
+        Carrega o arquivo de tarefas e organiza por tempo de ingresso.
+
+        Retorna um dicionário {tempo_ingresso: [dados_tarefa, ...]}, com o tempo
+        de ingresso como string (o mesmo formato do valor de clock recebido).
+        Usado pelo EMISSOR e pelo simulador offline.
+    '''
+
+    tarefas_por_tempo = {}
+    
+    with open(task_file, 'r') as arq:
+        for linha_num, linha in enumerate(arq, 1):
+            linha = linha.strip()
+            
+            if not linha:  # Ignora linhas vazias
+                continue
+                
+            try:
+                dados_tarefa = linha.split(';')
+                
+                if len(dados_tarefa) != 4:
+                    logger.warning("Aviso: Linha %d com formato inválido: %s", linha_num, linha)
+                    continue
+                
+                tempo_ingresso = dados_tarefa[1]
+                
+                # Organiza tarefas por tempo de ingresso
+                if tempo_ingresso not in tarefas_por_tempo:
+                    tarefas_por_tempo[tempo_ingresso] = []
+                    
+                tarefas_por_tempo[tempo_ingresso].append(dados_tarefa)
+                
+            except Exception as e:
+                logger.error("Erro ao processar linha %d: %s", linha_num, e)
+                continue
+    
+    return tarefas_por_tempo
+
+
+def task_to_dict(dados_tarefa: list[str]) -> dict:
+    '''
+        Converte uma linha do arquivo de tarefas no dicionário aceito por Thread.from_dict
+    '''
+
+    return {
+        'id': dados_tarefa[0],
+        'tempo_ingresso': int(dados_tarefa[1]),
+        'duracao_prevista': int(dados_tarefa[2]),
+        'prioridade': int(dados_tarefa[3])
+    }
+
+
+def open_task_source(task_file, streaming: bool = False, ordenar: bool = False):
+    '''
+        Abre o arquivo de tarefas na forma adequada, organizado por tempo de ingresso.
+
+        - Arquivo binário (ver binary_tasks): BinaryTaskReader, via mmap
+        - streaming/ordenar: SortedTaskReader, com ordenação externa opcional
+        - Caso contrário: dicionário carregado por load_tasks_by_time
+
+        Todas as formas aceitam get, pop, del, in e bool com o tempo como string.
+    '''
+
+    if is_binary_task_file(task_file):
+        return BinaryTaskReader(task_file)
+
+    if streaming or ordenar:
+        return open_task_stream(task_file, ordenar)
+
+    return load_tasks_by_time(task_file)
+
 
 class EMISSOR(BaseServer):
     '''
@@ -10,7 +89,13 @@ class EMISSOR(BaseServer):
         no momento apropriado, baseado no clock.
     '''
 
-    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int, arquivo):
+    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int, arquivo,
+                 streaming: bool = False, ordenar: bool = False):
+        '''
+            *streaming* (bool): lê as tarefas sob demanda, um clock por vez
+            (arquivo ordenado por tempo de ingresso), em vez de carregá-las todas
+            *ordenar* (bool): ordena o arquivo antes (ordenação externa); implica streaming
+        '''
 
         # Inicializar classe pai com informações do servidor
         super().__init__(host, emitter_port, "emissor")
@@ -21,7 +106,10 @@ class EMISSOR(BaseServer):
 
         # Atributos específicos do emissor
         self.task_file = arquivo                        # Arquivo fonte das tarefas
+        self.streaming = streaming or ordenar           # Leitura sob demanda do arquivo
+        self.ordenar = ordenar                          # Ordenação externa antes da leitura
         self.current_clock = None                       # Valor atual do clock recebido
+        self.clock_received = False                     # Pulso de clock aguardando confirmação
         self.running = True  
 
 
@@ -34,7 +122,7 @@ class EMISSOR(BaseServer):
             - "ESCALONADOR: ENCERRADO": Para o sistema (running = False)
         '''
         
-        print(f"Mensagem recebida: {message}")    
+        logger.debug("Mensagem recebida: %s", message)
 
         # Processar mensagem
         if message == "ESCALONADOR: ENCERRADO":
@@ -42,35 +130,42 @@ class EMISSOR(BaseServer):
 
         elif message.startswith("CLOCK: "):
             self.current_clock = message[7:]
+            self.clock_received = True
 
 
-    def send_thread_to_scheduler(self, thread_info: list):
+    def is_barrier_message(self, message) -> bool:
         '''
-            Envia uma thread para o escalonador via socket.
-            
-            Recebe uma lista com os dados da thread e cria o dicionário
-            para envio via JSON ao escalonador.
+            Pulsos de clock são barreiras: cada um é processado em uma chamada
+            de check_messages(), depois das demais mensagens já recebidas.
         '''
-        
+
+        return message.startswith("CLOCK: ")
+
+
+    def send_threads_to_scheduler(self, tarefas: list[list]):
+        '''
+            Envia todas as threads de um clock ao escalonador em uma única mensagem.
+
+            Cria uma mensagem JSON do tipo 'NEW_THREADS' com a lista de threads,
+            na ordem do arquivo de tarefas. Retorna True se o lote foi entregue.
+        '''
+
         try:
-            # Print informativo
-            print(f"Thread {thread_info[0]} com tempo: {thread_info[1]} entrando no tempo de clock {self.current_clock} \n")
-            
-            # Criar dicionário diretamente da lista
-            thread_data = {
-                'type': 'NEW_THREAD',
-                'thread': {
-                    'id': thread_info[0],
-                    'tempo_ingresso': int(thread_info[1]),
-                    'duracao_prevista': int(thread_info[2]),
-                    'prioridade': int(thread_info[3])
-                }
+            if logger.isEnabledFor(logging.DEBUG):
+                for thread_info in tarefas:
+                    logger.debug("Thread %s com tempo: %s entrando no tempo de clock %s \n", thread_info[0], thread_info[1],
+                                 self.current_clock)
+
+            threads_data = {
+                'type': 'NEW_THREADS',
+                'threads': [task_to_dict(thread_info) for thread_info in tarefas]
             }
-            
-            self.send_json_message(self.host, self.scheduler_port, thread_data)
-            
+
+            return self.send_json_message(self.host, self.scheduler_port, threads_data)
+
         except Exception as e:
-            print(f"Erro ao enviar thread para escalonador: {e}")
+            logger.error("Erro ao enviar threads para escalonador: %s", e)
+            return False
 
 
     def communication_scheduler(self):
@@ -87,7 +182,17 @@ class EMISSOR(BaseServer):
             self.send_json_message(self.host, self.scheduler_port, mensagem_data)
             
         except Exception as e:
-            print(f"Erro ao comunicar com escalonador: {e}")
+            logger.error("Erro ao comunicar com escalonador: %s", e)
+
+
+    def confirm_tick(self):
+        '''
+            Confirma ao clock que as chegadas do tick atual foram entregues.
+
+            Formato da mensagem: "EMISSOR: TICK {valor_atual} ENTREGUE"
+        '''
+
+        self.send_message(self.host, self.clock_port, f"EMISSOR: TICK {self.current_clock} ENTREGUE")
 
 
     def communication_clock(self):
@@ -104,43 +209,18 @@ class EMISSOR(BaseServer):
             self.send_message(self.host, self.clock_port, mensagem_clock)
             
         except Exception as e:
-            print(f"Erro ao comunicar com clock: {e}")
+            logger.error("Erro ao comunicar com clock: %s", e)
 
 
     def _load_and_organize_tasks(self):
         '''
             Carrega o arquivo de tarefas e organiza por tempo de ingresso.
+
+            Arquivos binários e o modo streaming leem do arquivo apenas as
+            tarefas do clock consultado (ver open_task_source).
         '''
 
-        tarefas_por_tempo = {}
-        
-        with open(self.task_file, 'r') as arq:
-            for linha_num, linha in enumerate(arq, 1):
-                linha = linha.strip()
-                
-                if not linha:  # Ignora linhas vazias
-                    continue
-                    
-                try:
-                    dados_tarefa = linha.split(';')
-                    
-                    if len(dados_tarefa) != 4:
-                        print(f"Aviso: Linha {linha_num} com formato inválido: {linha}")
-                        continue
-                    
-                    tempo_ingresso = dados_tarefa[1]
-                    
-                    # Organiza tarefas por tempo de ingresso
-                    if tempo_ingresso not in tarefas_por_tempo:
-                        tarefas_por_tempo[tempo_ingresso] = []
-                        
-                    tarefas_por_tempo[tempo_ingresso].append(dados_tarefa)
-                    
-                except Exception as e:
-                    print(f"Erro ao processar linha {linha_num}: {e}")
-                    continue
-        
-        return tarefas_por_tempo
+        return open_task_source(self.task_file, self.streaming, self.ordenar)
 
 
     def _process_tasks_for_current_time(self, tarefas):
@@ -148,12 +228,14 @@ class EMISSOR(BaseServer):
             Processa todas as tarefas para o tempo atual do clock.
             
             *tarefas* (list): Lista de tarefas a serem processadas
+
+            Retorna True se as tarefas foram entregues ao escalonador.
         '''
         
-        print(f"Processando {len(tarefas)} tarefas para o tempo {self.current_clock}")
+        logger.debug("Processando %d tarefas para o tempo %s", len(tarefas), self.current_clock)
         
-        for tarefa in tarefas:
-            self.send_thread_to_scheduler(tarefa)
+        # Todas as chegadas do clock seguem em uma única mensagem
+        return self.send_threads_to_scheduler(tarefas)
 
 
     def task_checker(self):
@@ -166,6 +248,7 @@ class EMISSOR(BaseServer):
             3. Para cada pulso do clock, verifica se há tarefas a emitir
             4. Envia tarefas prontas para o escalonador
             5. Notifica finalização quando todas as tarefas foram emitidas
+            6. Confirma ao clock a entrega do tick (também para pulsos reenviados)
             
             Formato do arquivo de tarefas:
             id;tempo_ingresso;duracao_prevista;prioridade        
@@ -186,34 +269,47 @@ class EMISSOR(BaseServer):
                 # Verifica se o servidor do emissor recebeu alguma mensagem
                 self.check_messages()
 
+                if not self.clock_received:
+                    continue
+
+                self.clock_received = False
+
                 # Processa apenas quando o clock avança
-                if self.current_clock is not None and self.current_clock != last_processed_clock:
+                if self.current_clock != last_processed_clock:
                     
                     # Processa tarefas do tempo atual
-                    if self.current_clock in tarefas_por_tempo:
-                        self._process_tasks_for_current_time(tarefas_por_tempo[self.current_clock])
+                    tarefas = tarefas_por_tempo.get(self.current_clock)
+
+                    if tarefas:
+
+                        # Sem confirmação o clock reenvia o pulso e a entrega é repetida
+                        if not self._process_tasks_for_current_time(tarefas):
+                            continue
+
                         del tarefas_por_tempo[self.current_clock]  # Remove tarefas já processadas
                     
                     # Verifica se todas as tarefas foram processadas
-                    if not tasks_finished and len(tarefas_por_tempo) == 0:
-                        print("TODAS AS TAREFAS FORAM EMITIDAS!\n")
+                    if not tasks_finished and not tarefas_por_tempo:
+                        logger.info("TODAS AS TAREFAS FORAM EMITIDAS!\n")
                         tasks_finished = True
-                        
-                        # Pequeno delay para garantir que o escalonador processe o clock atual
-                        time.sleep(0.05)  # 50ms de delay
 
-                        # Envia a mensagem no mesmo clock que terminou de emitir
+                        # Envia a mensagem no mesmo clock que terminou de emitir. Ela
+                        # chega ao escalonador depois das threads deste clock e antes
+                        # do pulso do clock, que só é enviado após a confirmação abaixo
                         self.communication_scheduler()
                                         
                     last_processed_clock = self.current_clock
 
+                # Libera o clock para enviar o pulso ao escalonador
+                self.confirm_tick()
+
             self.close_server()
-            print("EMISSOR ENCERRADO POR COMPLETO!")
+            logger.info("EMISSOR ENCERRADO POR COMPLETO!")
 
         except FileNotFoundError:
-            print(f"Arquivo não encontrado: {self.task_file}")
+            logger.error("Arquivo não encontrado: %s", self.task_file)
         except Exception as e:
-            print(f"Erro ao processar tarefas: {e}")
+            logger.error("Erro ao processar tarefas: %s", e)
 
 
     def start(self):
@@ -235,21 +331,29 @@ class EMISSOR(BaseServer):
             self.task_checker()
             
         except KeyboardInterrupt:
-            print("Interrompido pelo usuário")
+            logger.warning("Interrompido pelo usuário")
             self.running = False
             self.close_server()
 
         except Exception as e:
-            print(f"Erro geral: {e}")
+            logger.error("Erro geral: %s", e)
             self.close_server()
             
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Erro: Você deve passar exatamente 2 argumentos!")
-        print("Uso: python3 emissor_de_tarefas.py <arquivo_tarefas>")
 
-    arq_tarefas = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Emissor de tarefas")
+    parser.add_argument("arquivo_tarefas",
+                        help="arquivo de entrada (id;tempo_ingresso;duracao_prevista;prioridade ou binário de binary_tasks.py)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="lê as tarefas sob demanda (arquivo ordenado por tempo de ingresso)")
+    parser.add_argument("--ordenar", action="store_true",
+                        help="ordena o arquivo por tempo de ingresso antes da leitura em streaming")
+    parser.add_argument("--debug", action="store_true",
+                        help="exibe o detalhe de cada mensagem e de cada clock (padrão: apenas o resumo)")
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
 
     # Portas de comunicação
     clock_port = 4000
@@ -259,6 +363,7 @@ if __name__ == "__main__":
     # Host local
     host = "localhost"
 
-    emissor = EMISSOR(host, clock_port, emitter_port, scheduler_port, arq_tarefas)
+    emissor = EMISSOR(host, clock_port, emitter_port, scheduler_port, args.arquivo_tarefas,
+                      args.streaming, args.ordenar)
 
     emissor.start()
\ No newline at end of file
@@ -1,10 +1,26 @@
 from baseServer import BaseServer
-from models import Thread
-from algoritms import NonPreemptiveAlgorithm, RR_Algorithm, SRTF_Algorithm, PRIOp_Algorithm, PRIOd_Algorithm
-from file_writer import FileWriter
-from collections import deque
-import sys
+from models import Thread, Tarefa_Finalizada
+from algoritms import (NonPreemptiveAlgorithm, RR_Algorithm, MLFQ_Algorithm, CFS_Algorithm, SRTF_Algorithm,
+                       PRIOp_Algorithm, PRIOd_Algorithm)
+from file_writer import FileWriter, TIMELINE_FORMATS
+from ready_queue import (ReadyQueue, FIFOReadyQueue, ShortestTimeReadyQueue, PriorityReadyQueue, MultilevelReadyQueue,
+                         VirtualRuntimeReadyQueue)
+from multicore import MultiCoreAlgorithm
+from metrics import METRICS_FORMATS, Metrics, NullMetrics, create_metrics
+from log_config import configure_logging
+import argparse
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# MLFQ: quantum de cada nível (do mais ao menos prioritário) e clocks entre boosts
+MLFQ_QUANTA = (2, 4, 8)
+MLFQ_PERIODO_BOOST = 50
+
+# CFS: período, em clocks, em que todas as threads prontas executam, e menor fatia de tempo
+CFS_LATENCIA_ALVO = 12
+CFS_GRANULARIDADE_MINIMA = 2
 
 class ESCALONADOR(BaseServer):
     '''
@@ -15,13 +31,23 @@ class ESCALONADOR(BaseServer):
         de servidor da BaseServer para comunicação via sockets.
     '''
     
-    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int, algoritmo: str):
+    def __init__(self, host: str, clock_port: int, emitter_port: int, scheduler_port: int, algoritmo: str,
+                 buffer_size: int = 0, flush_interval: float | None = None, timeline_format: str = "legado",
+                 cpus: int = 1, metricas: Metrics | NullMetrics | None = None):
         '''
             Inicializa o escalonador com configurações de rede e algoritmo.
+
+            *buffer_size*, *flush_interval* e *timeline_format* configuram o FileWriter.
+            *cpus* (int): quantidade de núcleos simulados (modo multi-CPU se > 1)
+            *metricas*: instrumentação do caminho crítico (ver metrics.create_metrics);
+            desativada se None
         '''
 
         # Inicializar classe pai com informações do servidor
         super().__init__(host, scheduler_port, "escalonador")
+
+        if metricas is not None:
+            self.metricas = metricas
         
         # Portas de destino para comunicação
         self.clock_port: int = clock_port               # Porta de destino do CLOCK
@@ -30,24 +56,28 @@ class ESCALONADOR(BaseServer):
         # Atributos específicos do escalonador
         self.emitter_completed = False                  # Flag indicando se o emissor terminou
         self.current_clock = None                       # Valor atual do clock recebido
+        self.confirmed_clock = None                     # Último clock confirmado ao CLOCK
         self.algoritmo = algoritmo                      # Algoritmo de escalonamento escolhido
         
-        # Fila de threads prontas para execução
-        self.ready_threads: deque[Thread] = deque()
+        # Fila de threads prontas para execução, com a estrutura definida
+        # pela política de inserção do algoritmo escolhido
+        self.ready_threads: ReadyQueue = self.create_ready_queue(algoritmo)
         
         # Gerenciador de arquivos de saída
-        self.file_writer = FileWriter(algoritmo)
+        self.file_writer = FileWriter(algoritmo, buffer_size, flush_interval, timeline_format, self.metricas)
 
         # Serve para verificar se foi emitido uma nova tarefa no algoritmo PRIOd
         self.new_emiiter = False
 
-        # Determina a política de inserção de tarefas na fila de tarefas prontas
-        self.algoritmo_de_insercao = None               
+        # Gerar o diagrama de Gantt ao final da execução (em segundo plano)
+        self.gerar_grafico = True
 
         # Algoritmos disponíveis
         self.algorithms = {
             "fcfs": NonPreemptiveAlgorithm(),
             "rr": RR_Algorithm(quantum=3),
+            "mlfq": MLFQ_Algorithm(quanta=MLFQ_QUANTA, periodo_boost=MLFQ_PERIODO_BOOST),
+            "cfs": CFS_Algorithm(latencia_alvo=CFS_LATENCIA_ALVO, granularidade_minima=CFS_GRANULARIDADE_MINIMA),
             "sjf": NonPreemptiveAlgorithm(),
             "srtf": SRTF_Algorithm(),
             "prioc": NonPreemptiveAlgorithm(),
@@ -55,6 +85,13 @@ class ESCALONADOR(BaseServer):
             "priod": PRIOd_Algorithm()
         }
 
+        # Modo multi-CPU: cada núcleo executa sua própria cópia do algoritmo,
+        # e a fila de prontos do escalonador distribui as threads entre os núcleos
+        self.cpus = cpus
+        if cpus > 1 and algoritmo in self.algorithms:
+            self.algorithms[algoritmo] = MultiCoreAlgorithm(self.algorithms[algoritmo], cpus, self)
+            self.ready_threads = self.algorithms[algoritmo].ready_threads
+
 
     def process_message(self, message):
         '''
@@ -65,42 +102,103 @@ class ESCALONADOR(BaseServer):
             
             1. Mensagens JSON do Emissor:
                 - NEW_THREAD: Nova thread para escalonamento
+                - NEW_THREADS: Todas as threads que ingressam em um mesmo clock
                 - TAREFAS_FINALIZADAS: Sinalização de fim das emissões
             
             2. Mensagens String do Clock:
-                - "CLOCK: <valor>": Atualização do tempo do sistema
+                - "CLOCK: <valor>": Atualização do tempo do sistema. Um pulso
+                  reenviado de um clock já processado é apenas confirmado de novo.
         '''
         
         try:
             # Tentar interpretar como mensagem JSON do Emissor
+            inicio = self.metricas.start()
             data = json.loads(message)
+            self.metricas.record("json", inicio)
+            self.metricas.count(data.get('type'))
             
             if data.get('type') == 'NEW_THREAD':
                 # Nova thread chegou - inserir na fila conforme algoritmo
-                thread = Thread.from_dict(data['thread'])
-                
-                # Aplicar política de inserção baseada no algoritmo ativo
-                if self.algoritmo_de_insercao == "duração":
-                    self.insert_by_shortest_time(thread)
-
-                elif self.algoritmo_de_insercao == "prioridade":
-                    self.insert_by_priority(thread)
+                self.receive_thread(Thread.from_dict(data['thread']))
 
-                else:
-                    # FCFS e RR usam inserção simples (FIFO)
-                    self.ready_threads.appendleft(thread)
-
-                self.new_emiiter = True     # Sinalizar para aging no PRIOd
+            elif data.get('type') == 'NEW_THREADS':
+                # Lote de threads do mesmo clock - inserção em bloco na fila
+                self.receive_threads([Thread.from_dict(thread) for thread in data['threads']])
                 
             elif data.get('type') == 'TAREFAS_FINALIZADAS':
                 # Emissor terminou de enviar threads
                 self.emitter_completed = True
-                print(f"TAREFAS FINALIZADAS PELO EMISSOR recebido no clock {self.current_clock}! \n")  
+                logger.info("TAREFAS FINALIZADAS PELO EMISSOR recebido no clock %s! \n", self.current_clock)
                               
         except json.JSONDecodeError:
             # Mensagem não é JSON, processar como string
             if message.startswith("CLOCK: "):
-                self.current_clock = message[7:]
+                if message[7:] == self.confirmed_clock:
+                    self.metricas.count("CLOCK_REENVIADO")
+                    self.confirm_tick()
+                else:
+                    self.metricas.count("CLOCK")
+                    self.current_clock = message[7:]
+
+
+    def is_barrier_message(self, message) -> bool:
+        '''
+            Pulsos de clock são barreiras: cada um é processado em uma chamada
+            de check_messages(), depois das demais mensagens já recebidas.
+        '''
+
+        return message.startswith("CLOCK: ")
+
+
+    def receive_thread(self, thread: Thread):
+        '''
+            Recebe uma nova thread emitida e a insere na fila de prontos.
+
+            A fila aplica a política de inserção do algoritmo ativo.
+        '''
+
+        inicio = self.metricas.start()
+        self.ready_threads.push(thread)
+        self.metricas.record("fila", inicio)
+        self.new_emiiter = True     # Sinalizar para aging no PRIOd
+
+
+    def receive_threads(self, threads: list[Thread]):
+        '''
+            Recebe um lote de threads emitidas no mesmo clock.
+
+            As threads são inseridas em bloco, na ordem do lote.
+        '''
+
+        if not threads:
+            return
+
+        inicio = self.metricas.start()
+        self.ready_threads.extend(threads)
+        self.metricas.record("fila", inicio)
+        self.new_emiiter = True     # Sinalizar para aging no PRIOd
+
+
+    def record_completed_task(self, tarefa: Tarefa_Finalizada):
+        '''
+            Registra uma thread concluída nas estatísticas do arquivo de saída.
+        '''
+
+        self.file_writer.record_task(tarefa)
+
+
+    def confirm_tick(self):
+        '''
+            Confirma ao clock que o clock atual foi processado pelo algoritmo.
+
+            Chamado pelo loop do algoritmo ao fim de cada ciclo. O clock só
+            avança para o próximo tick depois de receber esta confirmação.
+
+            Formato da mensagem: "ESCALONADOR: TICK {valor_atual} CONCLUIDO"
+        '''
+
+        self.confirmed_clock = self.current_clock
+        self.send_message(self.host, self.clock_port, f"ESCALONADOR: TICK {self.current_clock} CONCLUIDO")
 
 
     def communication_clock(self):
@@ -112,7 +210,7 @@ class ESCALONADOR(BaseServer):
             self.send_message(self.host, self.clock_port, mensagem_clock)
             
         except Exception as e:
-            print(f"Erro ao comunicar com clock: {e}")
+            logger.error("Erro ao comunicar com clock: %s", e)
 
 
     def communication_emitter(self):
@@ -124,87 +222,38 @@ class ESCALONADOR(BaseServer):
             self.send_message(self.host, self.emitter_port, mensagem_emissor)
             
         except Exception as e:
-            print(f"Erro ao comunicar com emissor: {e}")
+            logger.error("Erro ao comunicar com emissor: %s", e)
 
 
-    def insert_by_shortest_time(self, tarefa: Thread):
-        '''
-            Insere thread mantendo fila ordenada por tempo restante (para SJF/SRTF).
-            
-            Estratégia: Fila ordenada DECRESCENTEMENTE por tempo restante.
-            Estrutura: [maior_tempo, ..., menor_tempo]
-            Operação: pop() sempre retira o menor tempo (final da fila)
-            
-            Esta organização permite:
-            - pop() em O(1) para obter thread mais curta
-            - append() em O(1) para threads muito longas ou muito curtas
-            - Inserção no meio apenas quando necessário
+    @staticmethod
+    def create_ready_queue(algoritmo: str) -> ReadyQueue:
         '''
+            Cria a fila de threads prontas adequada ao algoritmo.
 
-        # Fila vazia
-        if not self.ready_threads:
-            self.ready_threads.appendleft(tarefa)
-            return
-
-        duracao_nova = tarefa.duracao_prevista.tempo_restante
-
-        # Maior que o primeiro (vai para o início)
-        if duracao_nova >= self.ready_threads[0].duracao_prevista.tempo_restante:
-            self.ready_threads.appendleft(tarefa)
-        
-        # Menor que o último (vai para o final)
-        elif duracao_nova < self.ready_threads[-1].duracao_prevista.tempo_restante:
-            self.ready_threads.append(tarefa)
-
-        # Inserção no meio
-        else:
-            # Procura da direita para esquerda
-            for i in range(len(self.ready_threads) - 1, -1, -1):
-                if self.ready_threads[i].duracao_prevista.tempo_restante > duracao_nova:
-                    temp_list = list(self.ready_threads)
-                    temp_list.insert(i + 1, tarefa)
-                    self.ready_threads = deque(temp_list)
-                    return        
+            Políticas de inserção:
+            - SJF/SRTF: Heap ordenado por menor tempo restante
+            - PRIOc/PRIOp/PRIOd: Heap ordenado por menor prioridade dinâmica
+            - MLFQ: Uma fila FIFO por nível, com mapa de bits dos níveis não vazios
+            - CFS: Heap ordenado por menor vruntime
+            - FCFS/RR: Sem ordenação especial (FIFO)
 
-                
-    def insert_by_priority(self, tarefa: Thread):
+            Nas filas ordenadas, empates são resolvidos por ordem de chegada.
         '''
-            Política de inserção para algoritmo PRIOc e PRIOp.
-            
-            Mantém a fila de threads prontas ordenada em ordem DECRESCENTE de prioridade.
-            A thread com menor prioridade será sempre a última da fila (ready_threads[-1]),
-            permitindo que pop() retire sempre a thread mais prioridade primeiro.
 
-            Exemplo: [3, 3, 2, 1] - pop() retira 1 (maior prioridade)
+        if algoritmo in ["sjf", "srtf"]:
+            return ShortestTimeReadyQueue()
 
-            Complexidade: O(n) no pior caso, O(1) nos casos otimizados
-        '''
+        elif algoritmo in ["prioc", "priop", "priod"]:
+            return PriorityReadyQueue()
 
-        # Fila vazia
-        if not self.ready_threads:
-            self.ready_threads.appendleft(tarefa)
-            return
+        elif algoritmo == "mlfq":
+            return MultilevelReadyQueue(len(MLFQ_QUANTA))
 
-        nova_prioridade = tarefa.prioridade.prio_d
+        elif algoritmo == "cfs":
+            return VirtualRuntimeReadyQueue()
+
+        return FIFOReadyQueue()
 
-        # Maior que o primeiro (vai para o início)
-        if nova_prioridade >= self.ready_threads[0].prioridade.prio_d:
-            self.ready_threads.appendleft(tarefa)
-        
-        # Menor que o último (vai para o final)
-        elif nova_prioridade < self.ready_threads[-1].prioridade.prio_d:
-            self.ready_threads.append(tarefa)
-
-        # Inserção no meio
-        else:
-            # Procura da direita para esquerda
-            for i in range(len(self.ready_threads) - 1, -1, -1):
-                if self.ready_threads[i].prioridade.prio_d > nova_prioridade:
-                    prio_list = list(self.ready_threads)
-                    prio_list.insert(i + 1, tarefa)
-                    self.ready_threads = deque(prio_list)           
-                    return
-                
 
     def increment_priority(self):
         '''
@@ -213,10 +262,12 @@ class ESCALONADOR(BaseServer):
             Decrementa a prioridade dinâmica (prio_d) de todas as threads na fila,
             melhorando suas chances de execução. Chamado periodicamente pelo
             algoritmo PRIOd quando new_emitter=True.
+
+            Custo O(1): a fila avança sua época de aging e a prio_d de cada
+            thread é materializada apenas quando ela é consultada ou escalonada.
         '''
 
-        for tarefas in self.ready_threads:
-            tarefas.prioridade.prio_d -= 1
+        self.ready_threads.envelhecer()
 
 
     def start(self):
@@ -225,53 +276,63 @@ class ESCALONADOR(BaseServer):
     
             Fluxo de execução:
             1. Cria servidor socket para comunicação
-            2. Configura política de inserção baseada no algoritmo
-            3. Executa o algoritmo de escalonamento escolhido
+            2. Executa o algoritmo de escalonamento escolhido
 
-            Configurações de Política:
-            - SJF/SRTF: Ordenação por "duração" 
-            - PRIOc/PRIOp/PRIOd: Ordenação por "prioridade"
-            - FCFS/RR: Sem ordenação especial (FIFO)
+            A política de inserção já foi definida na criação da fila
+            de prontos (ver create_ready_queue).
         '''
 
         try:
             # Cria o servidor
             self.create_server()
 
-            # Configurar política de inserção conforme algoritmo
-            if self.algoritmo in ["sjf", "srtf"]:
-                self.algoritmo_de_insercao = "duração"
-
-            elif self.algoritmo in ["prioc", "priop", "priod"]:
-                self.algoritmo_de_insercao = "prioridade"
-                
-            # FCFS e RR não precisam de política especial
-
             # Executar algoritmo
             if self.algoritmo in self.algorithms:
                 self.algorithms[self.algoritmo].execute(self)
 
             else:
-                print("Algoritmo inválido!")
-                print("Algoritmos disponíveis: fcfs, rr, sjf, strf, prioc")
+                logger.error("Algoritmo inválido!")
+                logger.error("Algoritmos disponíveis: %s", ", ".join(self.algorithms))
                 self.close_server()
             
         except KeyboardInterrupt:
-            print("Interrompido pelo usuário")
+            logger.warning("Interrompido pelo usuário")
+            self.file_writer.close()
             self.close_server()
 
         except Exception as e:
-            print(f"Erro geral: {e}")
+            logger.error("Erro geral: %s", e)
+            self.file_writer.close()
             self.close_server()
 
 
 if __name__ == "__main__":
 
-    if len(sys.argv) != 2:
-        print("Erro: Você deve passar exatamente 2 argumentos!")
-        print("Uso: python3 escalonador_de_tarefas.py <algoritmo>!")
-
-    algoritmo = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Escalonador de tarefas")
+    parser.add_argument("algoritmo", help="fcfs, rr, mlfq, cfs, sjf, srtf, prioc, priop ou priod")
+    parser.add_argument("--buffer", type=int, default=0,
+                        help="entradas do timeline mantidas em memória antes de escrever no arquivo (0 = sem buffer)")
+    parser.add_argument("--flush-intervalo", type=float, default=None,
+                        help="tempo máximo, em segundos, entre escritas do buffer no arquivo")
+    parser.add_argument("--formato", choices=TIMELINE_FORMATS, default="legado",
+                        help="formato do timeline no arquivo de saída")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="quantidade de núcleos simulados, cada um com sua fila de prontos")
+    parser.add_argument("--metricas", default=None,
+                        help="arquivo para exportar as métricas de latência por fase e de mensagens por tipo")
+    parser.add_argument("--metricas-formato", choices=METRICS_FORMATS, default="jsonl",
+                        help="formato das métricas: linhas JSON ou texto do Prometheus")
+    parser.add_argument("--metricas-intervalo", type=float, default=1.0,
+                        help="intervalo, em segundos, entre exportações das métricas")
+    parser.add_argument("--sem-grafico", action="store_true",
+                        help="não gera o diagrama de Gantt ao final (ver diagrama_Gantt.py para gerar depois)")
+    parser.add_argument("--gravar-trace", default=None,
+                        help="arquivo para gravar as mensagens recebidas, reproduzíveis com replay.py")
+    parser.add_argument("--debug", action="store_true",
+                        help="exibe o detalhe de cada mensagem e de cada clock (padrão: apenas o resumo)")
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
 
     # Portas de comunicação
     clock_port = 4000
@@ -281,6 +342,12 @@ if __name__ == "__main__":
     # Host local
     host = "localhost"
 
-    escalonador = ESCALONADOR(host, clock_port, emitter_port, scheduler_port, algoritmo)
+    escalonador = ESCALONADOR(host, clock_port, emitter_port, scheduler_port, args.algoritmo,
+                              args.buffer, args.flush_intervalo, args.formato, args.cpus,
+                              create_metrics(args.metricas, args.metricas_formato, args.metricas_intervalo))
+    escalonador.gerar_grafico = not args.sem_grafico
+
+    if args.gravar_trace:
+        escalonador.start_trace(args.gravar_trace)
 
     escalonador.start()
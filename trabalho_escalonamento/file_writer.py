@@ -1,6 +1,28 @@
-import math
+import atexit
+import logging
 import os
+import shutil
+import time
+from metrics import NullMetrics
 from models import Tarefa_Finalizada
+from online_stats import OnlineStatistic, round_up
+from task_reader import external_sort
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceitos para a linha de timeline do arquivo de saída
+TIMELINE_FORMATS = ("legado", "rle")
+
+# Entrada do timeline legado para um clock em que a CPU ficou ociosa (modo multi-CPU)
+IDLE_ID = "-"
+
+
+def _id_tarefa(linha: str) -> str:
+    '''
+        Chave de ordenação das linhas de estatísticas: o ID da thread.
+    '''
+
+    return linha.split(";", 1)[0]
 
 
 class FileWriter:
@@ -11,19 +33,77 @@ class FileWriter:
         - Sequência de execução das threads (timeline de escalonamento)
         - Estatísticas individuais de cada thread concluída
         - Médias de turnaround time e waiting time
+
+        Modos de escrita do timeline:
+        - Direto (buffer_size=0): abre, escreve e fecha o arquivo a cada clock
+        - Bufferizado (buffer_size>0): mantém o arquivo aberto e acumula as
+          entradas em memória, descarregando-as no arquivo quando o buffer
+          atinge buffer_size entradas ou quando flush_interval segundos se
+          passaram desde a última descarga. Como cada descarga é enviada ao
+          sistema operacional, uma falha do processo perde no máximo o
+          conteúdo de um buffer.
+
+        Formatos do timeline (primeira linha do arquivo):
+        - "legado": o ID da thread a cada clock executado (t0;t0;t0;t1;)
+        - "rle": um segmento por execução contínua, no formato
+          thread_id:inicio:duracao (t0:0:3;t1:3:1;), onde inicio é a posição
+          do segmento no timeline. Segmentos são escritos assim que terminam.
+
+        No modo multi-CPU cada núcleo tem seu próprio FileWriter, e os clocks
+        ociosos também ocupam uma posição do timeline (ver write_idle), de
+        forma que a posição de cada entrada coincide com o clock.
     '''
     
 
-    def __init__(self, algorithm_name: str):
+    def __init__(self, algorithm_name: str, buffer_size: int = 0, flush_interval: float | None = None,
+                 timeline_format: str = "legado", metricas=None):
         '''
             Inicializa o FileWriter para um algoritmo específico.
+
+            *buffer_size* (int): máximo de entradas do timeline em memória (0 = sem buffer)
+            *flush_interval* (float): tempo máximo, em segundos, entre descargas do buffer
+            *timeline_format* (str): "legado" ou "rle"
+            *metricas*: instrumentação do escalonador (mede a escrita do timeline)
         '''
 
+        self.metricas = metricas if metricas is not None else NullMetrics()
+
+        if timeline_format not in TIMELINE_FORMATS:
+            raise ValueError(f"Formato de timeline inválido: {timeline_format}")
+
         # Criar pasta se não existir
         os.makedirs("arquivo_saidas", exist_ok=True)
 
         self.output_file = f"arquivo_saidas/algoritmo_{algorithm_name}.txt"
         self.initialize_file()
+
+        # Estatísticas das threads concluídas: linhas gravadas à medida que as
+        # threads terminam e acumuladores online das métricas
+        self.tasks_file = f"arquivo_saidas/algoritmo_{algorithm_name}_tarefas.tmp"
+        self.statistics_file = f"arquivo_saidas/algoritmo_{algorithm_name}_estatisticas.txt"
+        self.arquivo_tarefas = None
+        self.turnaround = OnlineStatistic()
+        self.waiting = OnlineStatistic()
+
+        # Configuração do modo bufferizado
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.buffer: list[str] = []
+        self.last_flush = time.monotonic()
+        self.arquivo = None
+
+        # Estado do formato RLE: segmento em andamento e posição no timeline
+        self.timeline_format = timeline_format
+        self.segmento_id = None
+        self.segmento_inicio = 0
+        self.segmento_duracao = 0
+        self.posicao = 0
+
+        if self.buffer_size > 0:
+            self.arquivo = open(self.output_file, "a")
+
+            # Garante a descarga do buffer no encerramento do processo
+            atexit.register(self.close)
     
 
     def initialize_file(self):
@@ -40,7 +120,7 @@ class FileWriter:
                 f.write("")
 
         except Exception as e:
-            print(f"Erro ao inicializar arquivo: {e}")
+            logger.error("Erro ao inicializar arquivo: %s", e)
 
     
     def write_thread_execution(self, thread_id: str):
@@ -50,17 +130,140 @@ class FileWriter:
             Adiciona o ID da thread ao arquivo, seguido de ponto e vírgula.
             Este método é chamado a cada ciclo de clock em que uma thread
             está sendo executada, criando um histórico completo do escalonamento.
+
+            No formato RLE, apenas estende o segmento atual; o segmento só é
+            escrito quando outra thread assume a CPU ou no encerramento.
+        '''
+
+        if self.timeline_format == "rle":
+            if thread_id == self.segmento_id:
+                self.segmento_duracao += 1
+            else:
+                self._close_segment()
+                self.segmento_id = thread_id
+                self.segmento_inicio = self.posicao
+                self.segmento_duracao = 1
+
+            self.posicao += 1
+
+        else:
+            self._write_entry(f"{thread_id};")
+
+
+    def write_idle(self):
         '''
+            Registra um clock em que a CPU ficou ociosa.
+
+            No formato legado escreve IDLE_ID; no RLE apenas encerra o
+            segmento atual e avança a posição, sem gerar segmento ocioso.
+        '''
+
+        if self.timeline_format == "rle":
+            self._close_segment()
+            self.posicao += 1
+
+        else:
+            self._write_entry(f"{IDLE_ID};")
+
+
+    def _close_segment(self):
+        '''
+            Escreve o segmento RLE em andamento, se houver.
+        '''
+
+        if self.segmento_id is not None:
+            self._write_entry(f"{self.segmento_id}:{self.segmento_inicio}:{self.segmento_duracao};")
+            self.segmento_id = None
+
+
+    def _write_entry(self, entrada: str):
+        '''
+            Escreve uma entrada do timeline, diretamente ou via buffer.
+        '''
+
+        if self.arquivo is not None:
+            self.buffer.append(entrada)
+
+            if len(self.buffer) >= self.buffer_size or \
+                (self.flush_interval is not None and time.monotonic() - self.last_flush >= self.flush_interval):
+                self.flush()
+
+            return
+
+        inicio = self.metricas.start()
 
         try:
             with open(self.output_file, "a") as f:
-                f.write(f"{thread_id};")
+                f.write(entrada)
 
         except Exception as e:
-            print(f"Erro ao escrever execução da thread: {e}")
+            logger.error("Erro ao escrever execução da thread: %s", e)
+
+        self.metricas.record("escrita", inicio)
+
+
+    def flush(self):
+        '''
+            Descarrega no arquivo as entradas do timeline acumuladas no buffer.
+        '''
+
+        if self.arquivo is None:
+            return
+
+        inicio = self.metricas.start()
+
+        try:
+            if self.buffer:
+                self.arquivo.write("".join(self.buffer))
+                self.buffer.clear()
+
+            self.arquivo.flush()
+            self.last_flush = time.monotonic()
+
+        except Exception as e:
+            logger.error("Erro ao descarregar buffer do timeline: %s", e)
+
+        self.metricas.record("escrita", inicio)
+
+
+    def close(self):
+        '''
+            Finaliza o timeline: escreve o segmento RLE pendente, descarrega
+            o buffer e fecha o arquivo mantido aberto.
+
+            Chamado ao escrever as estatísticas finais e no encerramento do processo.
+        '''
+
+        self._close_segment()
+
+        if self.arquivo is None:
+            return
+
+        self.flush()
+        self.arquivo.close()
+        self.arquivo = None
     
 
-    def write_final_statistics(self, tarefas_concluidas: list[Tarefa_Finalizada]):
+    def record_task(self, tarefa: Tarefa_Finalizada):
+        '''
+            Registra uma thread concluída, no momento da conclusão.
+
+            A linha da thread é gravada imediatamente em um arquivo auxiliar
+            (algoritmo_<nome>_tarefas.tmp) e as métricas entram nos acumuladores
+            online; nenhuma thread concluída fica guardada em memória.
+        '''
+
+        if self.arquivo_tarefas is None:
+            self.arquivo_tarefas = open(self.tasks_file, "w")
+
+        self.arquivo_tarefas.write(f"{tarefa.ID};{tarefa.clock_de_ingresso};{tarefa.clock_de_finalizacao};"
+                                   f"{tarefa.turn_around_time};{tarefa.waiting_time}\n")
+
+        self.turnaround.add(tarefa.turn_around_time)
+        self.waiting.add(tarefa.waiting_time)
+
+
+    def write_final_statistics(self, tarefas_concluidas: list[Tarefa_Finalizada] | None = None):
         '''
             Escreve as estatísticas finais de todas as threads concluídas.
             
@@ -71,42 +274,90 @@ class FileWriter:
             Formato de saída por linha:
             - Thread: ID;clock_ingresso;clock_finalização;turnaround_time;waiting_time
             - Médias: média_turnaround;média_waiting (arredondadas para cima)  
+
+            As threads são as registradas por record_task() (mais as de
+            *tarefas_concluidas*, se informadas). As linhas são ordenadas por
+            ID com ordenação externa, em memória limitada, e as médias vêm dos
+            acumuladores online. Os percentis vão para um arquivo à parte
+            (ver write_percentiles).
         '''
         
+        # Garante que todo o timeline já está no arquivo
+        self.close()
+
+        for tarefa in tarefas_concluidas or []:
+            self.record_task(tarefa)
+
         try:
             with open(self.output_file, "a") as f:
                 f.write("\n")  # Nova linha após a sequência de execução
-                
-                # Ordenar tarefas por ID
-                tarefas_concluidas.sort(key=lambda tarefa: tarefa.ID)
-                
-                # Variáveis para acumular as somas
-                total_turnaround = 0
-                total_waiting = 0
-
-                # Escrever informações de cada tarefa
-                for tarefa in tarefas_concluidas:
-                    f.write(f"{tarefa.ID};{tarefa.clock_de_ingresso};{tarefa.clock_de_finalizacao};"
-                           f"{tarefa.turn_around_time};{tarefa.waiting_time}\n")
-
-                    # Acumular para o cálculo das médias
-                    total_turnaround += tarefa.turn_around_time
-                    total_waiting += tarefa.waiting_time
-
-                # Calcular e escrever médias
-                if tarefas_concluidas:
-                    num_tarefas = len(tarefas_concluidas)
-                    media_turnaround = total_turnaround / num_tarefas
-                    media_waiting = total_waiting / num_tarefas
-                        
-                    # Arredondar para cima com 1 casa decimal
-                    media_turnaround_rounded = math.ceil(media_turnaround * 10) / 10
-                    media_waiting_rounded = math.ceil(media_waiting * 10) / 10
-                    
-                    f.write(f"{media_turnaround_rounded:.1f};{media_waiting_rounded:.1f}\n")
+
+                # Escrever informações de cada tarefa, ordenadas por ID
+                if self.arquivo_tarefas is not None:
+                    self.arquivo_tarefas.close()
+                    self.arquivo_tarefas = None
+
+                    ordenado = external_sort(self.tasks_file, chave=_id_tarefa)
+                    with open(ordenado, "r") as linhas:
+                        shutil.copyfileobj(linhas, f)
+
+                    os.remove(ordenado)
+                    os.remove(self.tasks_file)
+
+                # Escrever médias (arredondadas para cima com 1 casa decimal)
+                if self.turnaround.quantidade:
+                    f.write(f"{round_up(self.turnaround.mean()):.1f};{round_up(self.waiting.mean()):.1f}\n")
 
                 else:
                     f.write("0.0;0.0\n")
                     
         except Exception as e:
-            print(f"Erro ao escrever estatísticas finais: {e}")
\ No newline at end of file
+            logger.error("Erro ao escrever estatísticas finais: %s", e)
+
+        self.write_percentiles()
+
+
+    def write_percentiles(self):
+        '''
+            Escreve o resumo das métricas das threads concluídas.
+
+            Gera o arquivo algoritmo_<nome>_estatisticas.txt, ao lado do arquivo
+            de saída, com uma linha por métrica (turnaround e waiting):
+            métrica;média;máximo;p50;p95;p99
+
+            Média e máximo são exatos; os percentis são aproximados (erro
+            relativo de até 1/64, exatos para valores abaixo de 128).
+        '''
+
+        try:
+            with open(self.statistics_file, "w") as f:
+                for nome, metrica in (("turnaround", self.turnaround), ("waiting", self.waiting)):
+                    f.write(f"{nome};{round_up(metrica.mean()):.1f};{metrica.maximo or 0};"
+                            f"{metrica.percentile(50)};{metrica.percentile(95)};{metrica.percentile(99)}\n")
+
+        except Exception as e:
+            logger.error("Erro ao escrever percentis: %s", e)
+
+
+    def write_utilization(self, clocks_ocupados: list[int], clocks_totais: int):
+        '''
+            Escreve a utilização de cada núcleo no modo multi-CPU.
+
+            Gera o arquivo algoritmo_<nome>_utilizacao.txt, ao lado do arquivo
+            de saída, com uma linha por núcleo e uma linha agregada:
+            - Núcleo: cpu<n>;clocks_ocupados;clocks_totais;utilização(%)
+            - Agregado: total;soma_ocupados;clocks_totais*núcleos;utilização(%)
+        '''
+
+        arquivo_utilizacao = f"{os.path.splitext(self.output_file)[0]}_utilizacao.txt"
+        linhas = [(f"cpu{indice}", ocupados, clocks_totais) for indice, ocupados in enumerate(clocks_ocupados)]
+        linhas.append(("total", sum(clocks_ocupados), clocks_totais * len(clocks_ocupados)))
+
+        try:
+            with open(arquivo_utilizacao, "w") as f:
+                for nome, ocupados, total in linhas:
+                    utilizacao = 100 * ocupados / total if total else 0.0
+                    f.write(f"{nome};{ocupados};{total};{utilizacao:.1f}\n")
+
+        except Exception as e:
+            logger.error("Erro ao escrever utilização dos núcleos: %s", e)
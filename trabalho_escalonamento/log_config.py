@@ -0,0 +1,45 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+# Formato das mensagens: o mesmo texto que os componentes sempre exibiram
+FORMATO = "%(message)s"
+
+
+def configure_logging(debug: bool = False) -> logging.handlers.QueueListener:
+    '''
+        Configura o log dos componentes (CLOCK, EMISSOR, ESCALONADOR e simulador).
+
+        Os módulos registram mensagens com logging.getLogger(__name__):
+        - DEBUG: detalhes por mensagem e por clock (escalonamentos, pulsos...)
+        - INFO: resumo da execução (início, encerramento, totais)
+        - WARNING/ERROR: avisos e erros
+
+        Sem *debug*, apenas INFO e acima são emitidos; as chamadas de DEBUG
+        nem chegam a formatar a mensagem. Com *debug*, o detalhe por clock é
+        mantido.
+
+        A escrita não bloqueia o loop principal: o handler dos componentes só
+        coloca o registro em uma fila (QueueHandler), e uma thread à parte
+        (QueueListener) escreve na saída padrão. A fila é descarregada no
+        encerramento do processo.
+    '''
+
+    fila = queue.SimpleQueue()
+
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(logging.Formatter(FORMATO))
+
+    raiz = logging.getLogger()
+    raiz.handlers[:] = [logging.handlers.QueueHandler(fila)]
+    raiz.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    listener = logging.handlers.QueueListener(fila, saida)
+    listener.start()
+
+    # Escreve os registros pendentes antes de encerrar
+    atexit.register(listener.stop)
+
+    return listener
@@ -0,0 +1,91 @@
+import struct
+
+# Identificação do formato de trace de mensagens
+MAGIC = b"TRCM"
+VERSAO = 1
+
+# Cabeçalho: magic e versão
+CABECALHO = struct.Struct("<4sH")
+
+# Registro de cada mensagem: despacho (chamada de check_messages) em que foi
+# processada, clock corrente (-1 antes do primeiro pulso) e tamanho do
+# conteúdo em bytes, seguidos do conteúdo
+REGISTRO = struct.Struct("<IqI")
+
+
+class TraceRecorder:
+    '''
+        Grava as mensagens recebidas por um servidor em um arquivo de trace.
+
+        Cada mensagem é gravada no momento em que é despachada para
+        process_message(), na ordem de despacho (já com as barreiras de clock
+        posicionadas como em check_messages), junto com o clock corrente do
+        servidor e o número do despacho (a chamada de check_messages que a
+        processou). Reproduzir o trace com os mesmos despachos (ver replay.py)
+        leva o servidor exatamente à mesma sequência de estados, sem a
+        variação de tempo da comunicação por sockets.
+
+        Formato binário: CABECALHO seguido de um REGISTRO + conteúdo UTF-8
+        por mensagem.
+    '''
+
+    def __init__(self, arquivo: str):
+        self.arquivo_trace = arquivo
+        self._arquivo = open(arquivo, "wb")
+        self._arquivo.write(CABECALHO.pack(MAGIC, VERSAO))
+        self.mensagens = 0
+        self.despachos = 0
+
+
+    def next_dispatch(self):
+        '''
+            Inicia um novo despacho: as próximas mensagens foram processadas
+            em uma mesma chamada de check_messages.
+        '''
+
+        self.despachos += 1
+
+
+    def record(self, clock, message: str):
+        '''
+            Grava uma mensagem despachada no *clock* corrente (None antes do primeiro pulso).
+        '''
+
+        conteudo = message.encode('utf-8')
+        self._arquivo.write(REGISTRO.pack(self.despachos, -1 if clock is None else int(clock), len(conteudo)))
+        self._arquivo.write(conteudo)
+        self.mensagens += 1
+
+
+    def close(self):
+        if self._arquivo is None:
+            return
+
+        self._arquivo.close()
+        self._arquivo = None
+
+
+def read_trace(arquivo: str):
+    '''
+        Percorre um arquivo de trace, em ordem: (despacho, clock, mensagem).
+
+        O clock é None para mensagens despachadas antes do primeiro pulso.
+    '''
+
+    with open(arquivo, "rb") as trace:
+        magic, versao = CABECALHO.unpack(trace.read(CABECALHO.size))
+
+        if magic != MAGIC or versao != VERSAO:
+            raise ValueError(f"Arquivo {arquivo} não é um trace de mensagens (versão {VERSAO})")
+
+        while registro := trace.read(REGISTRO.size):
+            if len(registro) < REGISTRO.size:
+                raise ValueError(f"Trace {arquivo} truncado")
+
+            despacho, clock, tamanho = REGISTRO.unpack(registro)
+            conteudo = trace.read(tamanho)
+
+            if len(conteudo) < tamanho:
+                raise ValueError(f"Trace {arquivo} truncado")
+
+            yield despacho, (None if clock < 0 else clock), conteudo.decode('utf-8')
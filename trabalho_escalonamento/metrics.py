@@ -0,0 +1,214 @@
+import json
+import logging
+import time
+from online_stats import OnlineStatistic
+
+logger = logging.getLogger(__name__)
+
+# Formatos de exportação das métricas
+METRICS_FORMATS = ("jsonl", "prometheus")
+
+# Percentis exportados de cada fase
+PERCENTIS = (50, 95, 99)
+
+
+class NullMetrics:
+    '''
+        Instrumentação desativada (objeto nulo).
+
+        Tem a mesma interface de Metrics, com métodos vazios: os pontos
+        instrumentados do código não testam se a instrumentação está ativa,
+        e o custo com ela desligada é apenas o de uma chamada vazia.
+    '''
+
+    enabled = False
+
+    def start(self) -> int:
+        return 0
+
+
+    def record(self, fase: str, inicio: int):
+        pass
+
+
+    def count(self, tipo: str, quantidade: int = 1):
+        pass
+
+
+    def export_if_due(self):
+        pass
+
+
+    def close(self):
+        pass
+
+
+class Metrics:
+    '''
+        Instrumentação do caminho crítico do escalonador.
+
+        Registra a latência de cada fase (recepção de mensagens, decodificação
+        JSON, inserção na fila de prontos, processamento do tick, escrita do
+        timeline...) em histogramas de memória limitada (OnlineStatistic, em
+        nanossegundos) e conta mensagens por tipo.
+
+        Uso nos pontos instrumentados:
+            inicio = metricas.start()
+            ...
+            metricas.record("fase", inicio)
+
+        As métricas acumuladas desde o início da execução são exportadas para
+        *arquivo* a cada *intervalo* segundos (export_if_due) e no
+        encerramento (close):
+        - "jsonl": uma linha JSON por exportação, acrescentada ao arquivo
+        - "prometheus": o arquivo é reescrito no formato texto do Prometheus
+          (compatível com o textfile collector do node_exporter)
+    '''
+
+    enabled = True
+
+    def __init__(self, arquivo: str, formato: str = "jsonl", intervalo: float = 1.0, nome: str = "escalonador"):
+        if formato not in METRICS_FORMATS:
+            raise ValueError(f"Formato de métricas inválido: {formato} (use {', '.join(METRICS_FORMATS)})")
+
+        self.arquivo = arquivo
+        self.formato = formato
+        self.intervalo = intervalo
+        self.nome = nome
+
+        self.fases: dict[str, OnlineStatistic] = {}
+        self.mensagens: dict[str, int] = {}
+
+        self.inicio_execucao = time.monotonic()
+        self.ultima_exportacao = self.inicio_execucao
+
+        # Exportações JSON lines são acrescentadas: o arquivo começa vazio
+        if formato == "jsonl":
+            open(arquivo, "w").close()
+
+
+    def start(self) -> int:
+        '''
+            Marca o início de uma fase (contador de alta resolução, em ns).
+        '''
+
+        return time.perf_counter_ns()
+
+
+    def record(self, fase: str, inicio: int):
+        '''
+            Registra a duração de uma fase iniciada em *inicio* (ver start).
+        '''
+
+        duracao = time.perf_counter_ns() - inicio
+        estatistica = self.fases.get(fase)
+
+        if estatistica is None:
+            estatistica = self.fases[fase] = OnlineStatistic()
+
+        estatistica.add(duracao)
+
+
+    def count(self, tipo: str, quantidade: int = 1):
+        '''
+            Conta *quantidade* mensagens de *tipo*.
+        '''
+
+        self.mensagens[tipo] = self.mensagens.get(tipo, 0) + quantidade
+
+
+    def export_if_due(self):
+        '''
+            Exporta as métricas se já passou *intervalo* desde a última exportação.
+
+            Chamado uma vez por tick pelo loop do algoritmo.
+        '''
+
+        if time.monotonic() - self.ultima_exportacao >= self.intervalo:
+            self.export()
+
+
+    def export(self):
+        '''
+            Escreve as métricas acumuladas no arquivo, no formato configurado.
+        '''
+
+        self.ultima_exportacao = time.monotonic()
+
+        try:
+            if self.formato == "jsonl":
+                with open(self.arquivo, "a") as f:
+                    f.write(json.dumps(self.snapshot()) + "\n")
+
+            else:
+                with open(self.arquivo, "w") as f:
+                    f.write(self.prometheus())
+
+        except Exception as e:
+            logger.error("Erro ao exportar métricas: %s", e)
+
+
+    def snapshot(self) -> dict:
+        '''
+            Métricas acumuladas, com as latências em microssegundos.
+        '''
+
+        fases = {}
+
+        for fase, estatistica in self.fases.items():
+            fases[fase] = {
+                "quantidade": estatistica.quantidade,
+                "total_us": estatistica.soma / 1000,
+                "media_us": estatistica.mean() / 1000,
+                "max_us": estatistica.maximo / 1000,
+                **{f"p{p}_us": estatistica.percentile(p) / 1000 for p in PERCENTIS},
+            }
+
+        return {
+            "timestamp": time.time(),
+            "tempo_execucao_s": time.monotonic() - self.inicio_execucao,
+            "mensagens": dict(self.mensagens),
+            "fases": fases,
+        }
+
+
+    def prometheus(self) -> str:
+        '''
+            Métricas acumuladas no formato texto do Prometheus, com as
+            latências em segundos (um summary por fase).
+        '''
+
+        nome = f"{self.nome}_fase_segundos"
+        linhas = [f"# HELP {nome} Latência das fases do {self.nome}.", f"# TYPE {nome} summary"]
+
+        for fase, estatistica in self.fases.items():
+            for p in PERCENTIS:
+                linhas.append(f'{nome}{{fase="{fase}",quantile="{p / 100}"}} {estatistica.percentile(p) / 1e9:.9f}')
+
+            linhas.append(f'{nome}_sum{{fase="{fase}"}} {estatistica.soma / 1e9:.9f}')
+            linhas.append(f'{nome}_count{{fase="{fase}"}} {estatistica.quantidade}')
+
+        nome = f"{self.nome}_mensagens_total"
+        linhas += [f"# HELP {nome} Mensagens processadas por tipo.", f"# TYPE {nome} counter"]
+        linhas += [f'{nome}{{tipo="{tipo}"}} {quantidade}' for tipo, quantidade in self.mensagens.items()]
+
+        return "\n".join(linhas) + "\n"
+
+
+    def close(self):
+        '''
+            Exportação final, no encerramento.
+        '''
+
+        self.export()
+
+
+def create_metrics(arquivo: str | None, formato: str = "jsonl", intervalo: float = 1.0, nome: str = "escalonador"):
+    '''
+        Cria a instrumentação: Metrics se *arquivo* for informado, senão NullMetrics.
+    '''
+
+    if arquivo is None:
+        return NullMetrics()
+
+    return Metrics(arquivo, formato, intervalo, nome)
@@ -1,64 +1,50 @@
 from dataclasses import dataclass
 
-@dataclass
-class TempoExecucao:
-    '''
-        Representa informações de tempo de execução de uma thread.
-    '''
-
-    tempo_total: int
-    tempo_restante: int
-
-
-@dataclass
-class TipoPrioridade:
-    '''
-        Gerencia as prioridades estática e dinâmica de uma thread.
-    
-        Usado pelos algoritmos de escalonamento baseados em prioridade.
-        Valores menores indicam maior prioridade.
-    '''
-
-    prio_e: int
-    prio_d: int
-
-
-@dataclass
+@dataclass(slots=True)
 class Thread:
     '''
         Representa uma thread/processo a ser escalonado pelo sistema.
-        
+
         Contém todas as informações necessárias para o escalonamento,
-        incluindo tempo de chegada, duração prevista e prioridades.  
+        incluindo tempo de chegada, duração prevista e prioridades.
+
+        Registro plano com __slots__: os tempos de execução e as prioridades
+        são campos da própria thread, sem objetos aninhados nem __dict__ por
+        instância, reduzindo memória e acessos nos loops de escalonamento.
+
+        - tempo_total / tempo_restante: duração prevista e o que falta executar
+        - prio_e / prio_d: prioridades estática e dinâmica (menor = mais prioritária)
+        - nivel: nível da fila multinível do MLFQ (0 = mais prioritário)
+        - tempo_no_nivel: clocks já executados pela thread no nível atual (MLFQ)
+        - vruntime: tempo de execução virtual do CFS (ponderado pela prioridade)
     '''
 
     id: str
     tempo_ingresso: int
-    duracao_prevista: TempoExecucao
-    prioridade: TipoPrioridade
+    tempo_total: int
+    tempo_restante: int
+    prio_e: int
+    prio_d: int
+    nivel: int = 0
+    tempo_no_nivel: int = 0
+    vruntime: int = 0
 
     @classmethod
     def from_dict(cls, data):
         '''
             Cria uma instância de Thread a partir de um dicionário
+
+            Formato da mensagem NEW_THREAD do emissor:
+            {id, tempo_ingresso, duracao_prevista, prioridade}
         '''
 
         duracao = data['duracao_prevista']
         prioridade = data['prioridade']
 
-        return cls(
-            id=data['id'],
-            tempo_ingresso=data['tempo_ingresso'],
-            duracao_prevista= TempoExecucao(
-                tempo_total=duracao,
-                tempo_restante=duracao),
-            prioridade= TipoPrioridade(
-                prio_e=prioridade,
-                prio_d=prioridade)
-        )
+        return cls(data['id'], data['tempo_ingresso'], duracao, duracao, prioridade, prioridade)
 
 
-@dataclass
+@dataclass(slots=True)
 class Tarefa_Finalizada:
     '''
         Armazena informações de uma tarefa que foi concluída
@@ -68,4 +54,4 @@ class Tarefa_Finalizada:
     clock_de_ingresso: int
     clock_de_finalizacao: int
     turn_around_time: int
-    waiting_time: int
\ No newline at end of file
+    waiting_time: int
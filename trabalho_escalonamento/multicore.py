@@ -0,0 +1,218 @@
+import copy
+from algoritms import BaseAlgorithm
+from diagrama_Gantt import iniciar_renderizacao
+from file_writer import FileWriter
+from models import Thread, Tarefa_Finalizada
+from ready_queue import ReadyQueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CORE:
+    '''
+        Núcleo de CPU simulado no modo multi-CPU.
+
+        Cada núcleo tem sua própria fila de prontos, seu próprio timeline e
+        sua própria instância do algoritmo de escalonamento. Para o algoritmo,
+        o núcleo se comporta como o escalonador de uma única CPU: expõe
+        ready_threads, file_writer, current_clock, new_emiiter e
+        increment_priority(), de forma que as políticas de algoritms.py
+        funcionam por núcleo sem alterações.
+    '''
+
+    def __init__(self, indice: int, algoritmo: BaseAlgorithm, scheduler):
+        '''
+            *indice* (int): número do núcleo (0 a N-1)
+            *algoritmo* (BaseAlgorithm): instância da política exclusiva deste núcleo
+            *scheduler* (ESCALONADOR): escalonador ao qual o núcleo pertence
+        '''
+
+        self.indice = indice
+        self.algoritmo = algoritmo
+        self.scheduler = scheduler
+
+        # Fila de prontos local, com a mesma política de inserção do escalonador
+        self.ready_threads: ReadyQueue = scheduler.create_ready_queue(scheduler.algoritmo)
+
+        # Timeline do núcleo, com as mesmas configurações de escrita do escalonador
+        escritor = scheduler.file_writer
+        self.file_writer = FileWriter(f"{scheduler.algoritmo}_cpu{indice}", escritor.buffer_size,
+                                      escritor.flush_interval, escritor.timeline_format, escritor.metricas)
+
+        # Aging do PRIOd por núcleo
+        self.new_emiiter = False
+
+        # Clocks em que o núcleo executou alguma thread
+        self.clocks_ocupados = 0
+
+
+    @property
+    def current_clock(self):
+        return self.scheduler.current_clock
+
+
+    def record_completed_task(self, tarefa: Tarefa_Finalizada):
+        '''
+            As threads concluídas em qualquer núcleo vão para as estatísticas
+            do arquivo de saída principal.
+        '''
+
+        self.scheduler.record_completed_task(tarefa)
+
+
+    def increment_priority(self):
+        '''
+            Aplica aging (PRIOd) às threads da fila deste núcleo.
+        '''
+
+        self.ready_threads.envelhecer()
+
+
+    def carga(self) -> int:
+        '''
+            Quantidade de threads atribuídas ao núcleo (fila + em execução).
+        '''
+
+        return len(self.ready_threads) + self.algoritmo.tarefa_em_execucao
+
+
+    def livre_no_clock(self) -> bool:
+        '''
+            Indica se o núcleo ficará sem trabalho neste clock: não há thread
+            em execução (ou a atual já terminou) e a fila local está vazia.
+        '''
+
+        if len(self.ready_threads) > 0:
+            return False
+
+        algoritmo = self.algoritmo
+        return not algoritmo.tarefa_em_execucao or algoritmo.tarefa_no_momento.tempo_restante == 0
+
+
+class MultiCoreReadyQueue(ReadyQueue):
+    '''
+        Visão agregada das filas de prontos de todos os núcleos.
+
+        É a fila de prontos do escalonador no modo multi-CPU: as threads
+        recebidas do emissor são distribuídas, uma a uma e na ordem de
+        chegada, para o núcleo de menor carga (empate: menor índice).
+        Remoções são feitas pelos núcleos diretamente em suas filas locais.
+    '''
+
+    def __init__(self, nucleos: list[CORE]):
+        self.nucleos = nucleos
+
+
+    def push(self, thread: Thread):
+        min(self.nucleos, key=CORE.carga).ready_threads.push(thread)
+
+
+    def pop(self) -> Thread:
+        return max(self.nucleos, key=lambda nucleo: len(nucleo.ready_threads)).ready_threads.pop()
+
+
+    def peek(self) -> Thread:
+        return max(self.nucleos, key=lambda nucleo: len(nucleo.ready_threads)).ready_threads.peek()
+
+
+    def __len__(self):
+        return sum(len(nucleo.ready_threads) for nucleo in self.nucleos)
+
+
+    def __iter__(self):
+        for nucleo in self.nucleos:
+            yield from nucleo.ready_threads
+
+
+class MultiCoreAlgorithm(BaseAlgorithm):
+    '''
+        Escalonamento com N núcleos, cada um com sua fila de prontos.
+
+        A cada clock:
+        1. Uma nova emissão sinaliza aging (PRIOd) em todos os núcleos
+        2. Cada núcleo que ficaria ocioso rouba a próxima thread da fila
+           local mais longa entre os demais núcleos (work stealing)
+        3. Cada núcleo executa um ciclo da política escolhida (process_tick)
+
+        O loop principal é o de BaseAlgorithm; tarefa_em_execucao indica se
+        algum núcleo ainda está executando uma thread.
+    '''
+
+    def __init__(self, politica: BaseAlgorithm, cpus: int, scheduler):
+        '''
+            *politica* (BaseAlgorithm): algoritmo de referência, copiado para cada núcleo
+            *cpus* (int): quantidade de núcleos
+            *scheduler* (ESCALONADOR): escalonador que recebe as threads e o clock
+        '''
+
+        super().__init__()
+        self.nucleos = [CORE(indice, copy.deepcopy(politica), scheduler) for indice in range(cpus)]
+        self.ready_threads = MultiCoreReadyQueue(self.nucleos)
+        self.clocks_processados = 0
+
+
+    def process_tick(self, scheduler):
+        '''
+            Executa um ciclo de clock em todos os núcleos.
+        '''
+
+        if scheduler.new_emiiter:
+            for nucleo in self.nucleos:
+                nucleo.new_emiiter = True
+            scheduler.new_emiiter = False
+
+        for nucleo in self.nucleos:
+            if nucleo.livre_no_clock():
+                self._steal_task(nucleo)
+
+            nucleo.algoritmo.process_tick(nucleo)
+
+            if nucleo.algoritmo.tarefa_em_execucao:
+                nucleo.clocks_ocupados += 1
+            else:
+                nucleo.file_writer.write_idle()
+
+        self.clocks_processados += 1
+        self.tarefa_em_execucao = any(nucleo.algoritmo.tarefa_em_execucao for nucleo in self.nucleos)
+
+
+    def _steal_task(self, nucleo: CORE):
+        '''
+            Move para *nucleo* a próxima thread da fila local mais longa.
+
+            A thread roubada é a que a vítima escalonaria a seguir. Um núcleo
+            só é vítima se tem mais trabalho do que consegue executar sozinho.
+        '''
+
+        vitima = max(self.nucleos, key=lambda outro: len(outro.ready_threads))
+
+        if vitima is nucleo or vitima.carga() <= 1:
+            return
+
+        thread = vitima.ready_threads.pop()
+        nucleo.ready_threads.push(thread)
+        logger.debug("Thread: %s migrou do núcleo %d para o núcleo %d no clock %s\n",
+                     thread.id, vitima.indice, nucleo.indice, nucleo.current_clock)
+
+
+    def _finalize_execution(self, scheduler):
+        '''
+            Reúne os contadores de todos os núcleos, fecha os timelines por
+            núcleo e registra a utilização antes da finalização comum.
+        '''
+
+        self.escalonamentos = sum(nucleo.algoritmo.escalonamentos for nucleo in self.nucleos)
+        self.trocas_de_contexto = sum(nucleo.algoritmo.trocas_de_contexto for nucleo in self.nucleos)
+
+        for nucleo in self.nucleos:
+            nucleo.file_writer.close()
+
+        scheduler.file_writer.write_utilization([nucleo.clocks_ocupados for nucleo in self.nucleos],
+                                                self.clocks_processados)
+        super()._finalize_execution(scheduler)
+
+
+    def _render_chart(self, scheduler):
+        iniciar_renderizacao(scheduler.file_writer.output_file,
+                             [nucleo.file_writer.output_file for nucleo in self.nucleos])
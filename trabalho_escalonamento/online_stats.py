@@ -0,0 +1,116 @@
+import math
+
+# Bits de precisão do histograma: valores abaixo de 2**BITS_PRECISAO são
+# contados exatamente; acima, cada potência de 2 é dividida em
+# 2**(BITS_PRECISAO - 1) faixas (erro relativo de no máximo 1/64)
+BITS_PRECISAO = 7
+
+
+def round_up(valor: float) -> float:
+    '''
+        Arredonda para cima com 1 casa decimal (formato das médias do arquivo de saída).
+    '''
+
+    return math.ceil(valor * 10) / 10
+
+
+class LogHistogram:
+    '''
+        Histograma logarítmico de inteiros, em memória limitada.
+
+        Cada valor é contado em uma faixa cuja largura cresce com a ordem de
+        grandeza do valor (como no HdrHistogram): valores pequenos ficam em
+        faixas exatas e os demais com erro relativo limitado. A quantidade de
+        faixas cresce apenas com o logaritmo do maior valor, nunca com a
+        quantidade de valores registrados.
+    '''
+
+    def __init__(self):
+        self.contagens: dict[int, int] = {}
+        self.total = 0
+
+
+    @staticmethod
+    def _faixa(valor: int) -> int:
+        '''
+            Chave da faixa do valor. A ordem das chaves é a ordem dos valores.
+        '''
+
+        if valor < 0:
+            return valor
+
+        expoente = max(0, valor.bit_length() - BITS_PRECISAO)
+        return (expoente << BITS_PRECISAO) | (valor >> expoente)
+
+
+    @staticmethod
+    def _valor(faixa: int) -> int:
+        '''
+            Valor representativo (ponto médio) de uma faixa.
+        '''
+
+        if faixa < 0:
+            return faixa
+
+        expoente = faixa >> BITS_PRECISAO
+        mantissa = faixa & ((1 << BITS_PRECISAO) - 1)
+        inferior = mantissa << expoente
+        superior = ((mantissa + 1) << expoente) - 1
+
+        return (inferior + superior) // 2
+
+
+    def add(self, valor: int):
+        faixa = self._faixa(valor)
+        self.contagens[faixa] = self.contagens.get(faixa, 0) + 1
+        self.total += 1
+
+
+    def percentile(self, percentual: float) -> int:
+        '''
+            Retorna o valor aproximado do percentil (0 a 100).
+        '''
+
+        if self.total == 0:
+            return 0
+
+        posicao = max(1, math.ceil(percentual / 100 * self.total))
+        acumulado = 0
+
+        for faixa in sorted(self.contagens):
+            acumulado += self.contagens[faixa]
+
+            if acumulado >= posicao:
+                return self._valor(faixa)
+
+        return self._valor(max(self.contagens))
+
+
+class OnlineStatistic:
+    '''
+        Acumula uma métrica (ex.: turnaround time) à medida que as tarefas terminam.
+
+        Mantém quantidade, soma e máximo exatos e um LogHistogram para os
+        percentis aproximados, sem guardar os valores individuais.
+    '''
+
+    def __init__(self):
+        self.quantidade = 0
+        self.soma = 0
+        self.maximo = None
+        self.histograma = LogHistogram()
+
+
+    def add(self, valor: int):
+        self.quantidade += 1
+        self.soma += valor
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        self.histograma.add(valor)
+
+
+    def mean(self) -> float:
+        return self.soma / self.quantidade if self.quantidade else 0.0
+
+
+    def percentile(self, percentual: float) -> int:
+        return self.histograma.percentile(percentual)
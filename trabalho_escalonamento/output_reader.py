@@ -0,0 +1,116 @@
+from file_writer import IDLE_ID
+
+# Quantidade de caracteres lidos por vez da linha de timeline
+TAMANHO_BLOCO = 64 * 1024
+
+
+def _timeline_tokens(arq):
+    '''
+        Gera as entradas (separadas por ';') da primeira linha do arquivo.
+
+        Lê o arquivo em blocos de TAMANHO_BLOCO caracteres. Ao terminar,
+        retorna (via StopIteration) o texto lido além da quebra de linha,
+        que pertence às linhas de estatísticas.
+    '''
+
+    pendente = ""
+
+    while True:
+        bloco = arq.read(TAMANHO_BLOCO)
+        fim_linha = bloco.find("\n")
+
+        if fim_linha != -1 or not bloco:
+            if fim_linha != -1:
+                pendente += bloco[:fim_linha]
+                restante = bloco[fim_linha + 1:]
+            else:
+                restante = ""
+
+            for entrada in pendente.split(";"):
+                if entrada:
+                    yield entrada
+
+            return restante
+
+        pendente += bloco
+        *completas, pendente = pendente.split(";")
+
+        for entrada in completas:
+            if entrada:
+                yield entrada
+
+
+def iter_timeline(nome_arquivo):
+    '''
+        Percorre o timeline de um arquivo de saída como segmentos de execução.
+
+        Gera tuplas (thread_id, inicio, duracao), onde inicio é a posição do
+        segmento no timeline. Aceita os formatos "legado" (um ID por clock,
+        agrupado em segmentos durante a leitura) e "rle" (thread_id:inicio:duracao).
+
+        Clocks ociosos (IDLE_ID, timelines por núcleo) ocupam uma posição
+        mas não geram segmentos.
+    '''
+
+    with open(nome_arquivo, 'r') as arq:
+        segmento_id = None
+        inicio = 0
+        duracao = 0
+
+        for entrada in _timeline_tokens(arq):
+
+            # Formato RLE: o segmento já vem pronto
+            if ":" in entrada:
+                thread_id, inicio_rle, duracao_rle = entrada.rsplit(":", 2)
+                yield thread_id, int(inicio_rle), int(duracao_rle)
+                continue
+
+            # Formato legado: agrupa IDs consecutivos iguais
+            if entrada == segmento_id:
+                duracao += 1
+            else:
+                if segmento_id is not None and segmento_id != IDLE_ID:
+                    yield segmento_id, inicio, duracao
+
+                inicio += duracao
+                segmento_id = entrada
+                duracao = 1
+
+        if segmento_id is not None and segmento_id != IDLE_ID:
+            yield segmento_id, inicio, duracao
+
+
+def iter_statistics(nome_arquivo):
+    '''
+        Percorre as linhas de estatísticas de um arquivo de saída.
+
+        Gera cada linha após o timeline já separada por ';':
+        - Threads: [ID, clock_ingresso, clock_finalização, turnaround_time, waiting_time]
+        - Última linha: [média_turnaround, média_waiting]
+    '''
+
+    with open(nome_arquivo, 'r') as arq:
+
+        # Descarta o timeline, guardando o que foi lido além dele
+        entradas = _timeline_tokens(arq)
+        try:
+            while True:
+                next(entradas)
+        except StopIteration as fim:
+            restante = fim.value
+
+        *linhas, parcial = restante.split("\n")
+
+        for linha in linhas:
+            if linha:
+                yield linha.split(";")
+
+        for linha in arq:
+            linha = (parcial + linha).rstrip("\n")
+            parcial = ""
+
+            if linha:
+                yield linha.split(";")
+
+        if parcial:
+            yield parcial.split(";")
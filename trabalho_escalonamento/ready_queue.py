@@ -0,0 +1,394 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import cache
+from itertools import count
+from models import Thread
+
+
+class ReadyQueue(ABC):
+    '''
+        Interface comum das filas de threads prontas do escalonador.
+
+        Os algoritmos de escalonamento manipulam a fila apenas por meio
+        destes métodos, de forma que a estrutura de dados concreta
+        (FIFO ou heap) é escolhida pelo escalonador conforme o algoritmo.
+    '''
+
+    @abstractmethod
+    def push(self, thread: Thread):
+        '''
+            Insere uma thread na fila de prontos.
+        '''
+        pass
+
+
+    def extend(self, threads: list[Thread]):
+        '''
+            Insere várias threads, na ordem da lista.
+
+            Equivale a chamar push() para cada thread.
+        '''
+
+        for thread in threads:
+            self.push(thread)
+
+
+    @abstractmethod
+    def pop(self) -> Thread:
+        '''
+            Remove e retorna a próxima thread a ser escalonada.
+        '''
+        pass
+
+
+    @abstractmethod
+    def peek(self) -> Thread:
+        '''
+            Retorna a próxima thread a ser escalonada, sem removê-la.
+        '''
+        pass
+
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+
+    @abstractmethod
+    def __iter__(self):
+        pass
+
+
+class FIFOReadyQueue(ReadyQueue):
+    '''
+        Fila de prontos em ordem de chegada (FCFS e RR).
+
+        Inserção e remoção em O(1) usando deque.
+    '''
+
+    def __init__(self):
+        self._fila: deque[Thread] = deque()
+
+
+    def push(self, thread: Thread):
+        self._fila.append(thread)
+
+
+    def extend(self, threads: list[Thread]):
+        self._fila.extend(threads)
+
+
+    def pop(self) -> Thread:
+        return self._fila.popleft()
+
+
+    def peek(self) -> Thread:
+        return self._fila[0]
+
+
+    def __len__(self):
+        return len(self._fila)
+
+
+    def __iter__(self):
+        return iter(self._fila)
+
+
+class HeapReadyQueue(ReadyQueue):
+    '''
+        Fila de prontos ordenada por uma chave numérica (heap binário).
+
+        A thread com a MENOR chave é sempre a próxima a ser escalonada.
+        Em caso de empate, vence a thread inserida primeiro (FIFO).
+
+        Cada entrada do heap é a lista [chave, ordem_de_insercao, thread].
+
+        Complexidade: O(log n) para push() e pop(), O(1) para peek().
+    '''
+
+    def __init__(self, chave):
+        '''
+            *chave* (callable): função que extrai da thread o valor de ordenação
+        '''
+
+        self._heap: list[list] = []
+        self._chave = chave
+        self._ordem = count()
+
+
+    def push(self, thread: Thread):
+        heapq.heappush(self._heap, [self._chave(thread), next(self._ordem), thread])
+
+
+    def extend(self, threads: list[Thread]):
+        '''
+            Insere várias threads de uma vez.
+
+            Para lotes grandes em relação à fila, acrescenta as entradas e
+            reconstrói o heap em O(n + k), em vez de k inserções O(log n).
+            A ordem de saída é a mesma de inserções individuais.
+        '''
+
+        if len(threads) < len(self._heap):
+            super().extend(threads)
+            return
+
+        self._heap.extend([self._chave(thread), next(self._ordem), thread] for thread in threads)
+        heapq.heapify(self._heap)
+
+
+    def pop(self) -> Thread:
+        return self._materializar(heapq.heappop(self._heap))
+
+
+    def peek(self) -> Thread:
+        return self._materializar(self._heap[0])
+
+
+    def __len__(self):
+        return len(self._heap)
+
+
+    def __iter__(self):
+        return (self._materializar(entrada) for entrada in self._heap)
+
+
+    def _materializar(self, entrada: list) -> Thread:
+        '''
+            Retorna a thread da entrada com seus campos atualizados.
+
+            Ponto de extensão para filas que mantêm parte do estado da
+            thread apenas na chave do heap.
+        '''
+
+        return entrada[2]
+
+
+class ShortestTimeReadyQueue(HeapReadyQueue):
+    '''
+        Fila de prontos ordenada pelo menor tempo restante (SJF e SRTF).
+    '''
+
+    def __init__(self):
+        super().__init__(lambda thread: thread.tempo_restante)
+
+
+class PriorityReadyQueue(HeapReadyQueue):
+    '''
+        Fila de prontos ordenada pela prioridade dinâmica (PRIOc, PRIOp e PRIOd).
+
+        Valores menores de prio_d indicam maior prioridade.
+
+        O aging do PRIOd é feito de forma preguiçosa por uma época global:
+        a chave guardada no heap é prio_d + época no momento da inserção, e
+        a prioridade efetiva de uma thread na fila é chave - época atual.
+        Assim, envelhecer todas as threads é apenas incrementar a época, e a
+        ordem do heap continua válida sem reordenação. A prio_d da thread só
+        é atualizada quando ela é consultada (peek/iteração) ou removida (pop).
+    '''
+
+    def __init__(self):
+        super().__init__(lambda thread: thread.prio_d + self._epoca)
+        self._epoca = 0
+
+
+    def envelhecer(self):
+        '''
+            Aplica aging a todas as threads da fila (PRIOd) em O(1).
+
+            Equivale a decrementar em 1 a prio_d de cada thread na fila.
+        '''
+
+        self._epoca += 1
+
+
+    def _materializar(self, entrada: list) -> Thread:
+        thread = entrada[2]
+        thread.prio_d = entrada[0] - self._epoca
+        return thread
+
+
+class MultilevelReadyQueue(ReadyQueue):
+    '''
+        Fila de prontos multinível do MLFQ.
+
+        Uma fila FIFO (deque) por nível, 0 sendo o mais prioritário. Cada
+        thread é inserida no nível indicado em thread.nivel, e a próxima a
+        ser escalonada é a primeira do nível não vazio mais prioritário.
+
+        Um mapa de bits (inteiro) marca os níveis não vazios: o nível mais
+        prioritário é o bit menos significativo ligado, obtido em O(1)
+        independentemente da quantidade de threads na fila.
+
+        Complexidade: O(1) para push(), pop() e peek(); boost() move as
+        threads entre deques em lote.
+    '''
+
+    def __init__(self, niveis: int):
+        self._niveis: list[deque[Thread]] = [deque() for _ in range(niveis)]
+        self._ocupados = 0      # Bit i ligado: nível i não vazio
+        self._tamanho = 0
+
+
+    def push(self, thread: Thread):
+        self._niveis[thread.nivel].append(thread)
+        self._ocupados |= 1 << thread.nivel
+        self._tamanho += 1
+
+
+    def extend(self, threads: list[Thread]):
+        for thread in threads:
+            self._niveis[thread.nivel].append(thread)
+            self._ocupados |= 1 << thread.nivel
+
+        self._tamanho += len(threads)
+
+
+    def pop(self) -> Thread:
+        '''
+            Remove a próxima thread, atualizando thread.nivel para o nível
+            de onde ela saiu. Se o nível mudou (boost), o tempo executado no
+            nível é zerado.
+        '''
+
+        nivel = self.highest_level()
+        fila = self._niveis[nivel]
+        thread = fila.popleft()
+
+        if not fila:
+            self._ocupados &= ~(1 << nivel)
+
+        self._tamanho -= 1
+        self._atualizar_nivel(thread, nivel)
+        return thread
+
+
+    def peek(self) -> Thread:
+        nivel = self.highest_level()
+        thread = self._niveis[nivel][0]
+        self._atualizar_nivel(thread, nivel)
+        return thread
+
+
+    @staticmethod
+    def _atualizar_nivel(thread: Thread, nivel: int):
+        '''
+            Aplica à thread o nível da fila em que ela está.
+        '''
+
+        if thread.nivel != nivel:
+            thread.nivel = nivel
+            thread.tempo_no_nivel = 0
+
+
+    def highest_level(self) -> int:
+        '''
+            Nível não vazio mais prioritário (-1 se a fila está vazia).
+        '''
+
+        return (self._ocupados & -self._ocupados).bit_length() - 1
+
+
+    def boost(self):
+        '''
+            Move todas as threads para o nível 0 (boost periódico do MLFQ).
+
+            As threads de cada nível vão para o fim do nível 0, na ordem dos
+            níveis. O nível de cada thread (e o tempo executado no nível) é
+            atualizado apenas quando ela é consultada ou removida, sem
+            percorrer a fila; as que já estavam no nível 0 mantêm o tempo
+            executado nele.
+        '''
+
+        topo = self._niveis[0]
+
+        for fila in self._niveis[1:]:
+            topo.extend(fila)
+            fila.clear()
+
+        self._ocupados = 1 if topo else 0
+
+
+    def __len__(self):
+        return self._tamanho
+
+
+    def __iter__(self):
+        for fila in self._niveis:
+            yield from fila
+
+
+# CFS: peso de uma thread de prioridade 0; cada nível de prioridade a mais
+# divide o peso por FATOR_PESO (como os níveis de nice do Linux)
+PESO_BASE = 1024
+FATOR_PESO = 1.25
+
+# CFS: vruntime acumulado por clock de execução de uma thread de peso PESO_BASE
+ESCALA_VRUNTIME = 1 << 20
+
+
+@cache
+def peso_da_prioridade(prioridade: int) -> int:
+    '''
+        Peso de uma thread no CFS: menor prioridade (mais prioritária) = maior peso.
+
+        Calculado uma vez por valor de prioridade (cache).
+    '''
+
+    return max(1, round(PESO_BASE / FATOR_PESO ** prioridade))
+
+
+class VirtualRuntimeReadyQueue(HeapReadyQueue):
+    '''
+        Fila de prontos ordenada pelo menor vruntime (CFS).
+
+        Além do heap (O(log n) por inserção e remoção), mantém:
+        - min_vruntime: limite inferior monotônico dos vruntimes da fila e da
+          thread em execução (ver update_min_vruntime). Uma thread inserida
+          com vruntime menor (nova ou migrada de outro núcleo) começa em
+          min_vruntime, para não monopolizar a CPU até alcançar as demais.
+        - peso_total: soma dos pesos das threads na fila, usada no cálculo
+          da fatia de tempo de cada thread.
+    '''
+
+    def __init__(self):
+        super().__init__(lambda thread: thread.vruntime)
+        self.min_vruntime = 0
+        self.peso_total = 0
+
+
+    def push(self, thread: Thread):
+        thread.vruntime = max(thread.vruntime, self.min_vruntime)
+        self.peso_total += peso_da_prioridade(thread.prio_e)
+        super().push(thread)
+
+
+    def extend(self, threads: list[Thread]):
+        if len(threads) < len(self._heap):
+            ReadyQueue.extend(self, threads)
+            return
+
+        for thread in threads:
+            thread.vruntime = max(thread.vruntime, self.min_vruntime)
+            self.peso_total += peso_da_prioridade(thread.prio_e)
+
+        super().extend(threads)
+
+
+    def pop(self) -> Thread:
+        thread = super().pop()
+        self.peso_total -= peso_da_prioridade(thread.prio_e)
+        return thread
+
+
+    def update_min_vruntime(self, vruntime_atual: int):
+        '''
+            Avança min_vruntime até o menor vruntime entre a thread em
+            execução (*vruntime_atual*) e a primeira da fila.
+        '''
+
+        if self._heap:
+            vruntime_atual = min(vruntime_atual, self._heap[0][0])
+
+        self.min_vruntime = max(self.min_vruntime, vruntime_atual)
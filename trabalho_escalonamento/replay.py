@@ -0,0 +1,136 @@
+from escalanador_de_tarefas import ESCALONADOR
+from message_trace import read_trace
+from metrics import METRICS_FORMATS, Metrics, NullMetrics, create_metrics
+from log_config import configure_logging
+from file_writer import TIMELINE_FORMATS
+from itertools import groupby
+from operator import itemgetter
+import argparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class REPLAY(ESCALONADOR):
+    '''
+        Reprodução determinística de um trace de mensagens do escalonador.
+
+        Alimenta o ESCALONADOR com as mensagens gravadas em uma execução em
+        rede (escalanador_de_tarefas.py --gravar-trace), sem sockets e sem
+        esperas: cada chamada de check_messages() despacha exatamente as
+        mensagens de um despacho gravado, na mesma ordem. A mesma entrada
+        produz sempre a mesma saída, o que permite comparar o desempenho de
+        alterações no escalonador sem o ruído de tempo da comunicação (ex.:
+        um NEW_THREAD atrasado chegando um clock depois).
+
+        Com o algoritmo da gravação, os arquivos de saída são idênticos aos
+        da execução em rede. Com outro algoritmo, a sequência de entrada é a
+        mesma; se o trace terminar antes das tarefas, o clock continua
+        avançando de um em um, como faria o CLOCK.
+    '''
+
+    def __init__(self, arquivo_trace: str, algoritmo: str, buffer_size: int = 4096, flush_interval: float | None = None,
+                 timeline_format: str = "legado", cpus: int = 1, metricas: Metrics | NullMetrics | None = None):
+
+        # Nenhuma porta é usada na reprodução
+        super().__init__("localhost", None, None, None, algoritmo, buffer_size, flush_interval, timeline_format, cpus,
+                         metricas)
+
+        self.arquivo_trace = arquivo_trace
+
+        # Despachos gravados: (número do despacho, mensagens do despacho)
+        self.despachos = groupby(read_trace(arquivo_trace), key=itemgetter(0))
+        self.mensagens_reproduzidas = 0
+        self.clocks_extras = 0
+
+
+    def check_messages(self):
+        '''
+            Reproduz o próximo despacho gravado.
+
+            Depois do fim do trace, apenas avança o clock.
+        '''
+
+        despacho = next(self.despachos, None)
+
+        if despacho is None:
+            if self.current_clock is None:
+                raise ValueError(f"Trace {self.arquivo_trace} não contém nenhum pulso de clock")
+
+            if self.clocks_extras == 0:
+                logger.warning("Fim do trace no clock %s; o clock continua avançando até o fim das tarefas",
+                               self.current_clock)
+
+            self.clocks_extras += 1
+            self.current_clock = str(int(self.current_clock) + 1)
+            return
+
+        for _, _, message in despacho[1]:
+            inicio = self.metricas.start()
+            self.process_message(message)
+            self.metricas.record("processamento", inicio)
+            self.mensagens_reproduzidas += 1
+
+
+    def create_server(self):
+        pass
+
+
+    def close_server(self):
+        pass
+
+
+    def confirm_tick(self):
+        self.confirmed_clock = self.current_clock
+
+
+    def communication_clock(self):
+        pass
+
+
+    def communication_emitter(self):
+        pass
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Reprodução determinística de um trace do escalonador")
+    parser.add_argument("arquivo_trace", help="trace gravado com escalanador_de_tarefas.py --gravar-trace")
+    parser.add_argument("algoritmo", help="fcfs, rr, mlfq, cfs, sjf, srtf, prioc, priop ou priod")
+    parser.add_argument("--buffer", type=int, default=4096,
+                        help="entradas do timeline mantidas em memória antes de escrever no arquivo (0 = sem buffer)")
+    parser.add_argument("--formato", choices=TIMELINE_FORMATS, default="legado",
+                        help="formato do timeline no arquivo de saída")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="quantidade de núcleos simulados, cada um com sua fila de prontos")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="quantidade de reproduções (para medir o desempenho; vale a mais rápida)")
+    parser.add_argument("--metricas", default=None,
+                        help="arquivo para exportar as métricas de latência por fase e de mensagens por tipo")
+    parser.add_argument("--metricas-formato", choices=METRICS_FORMATS, default="jsonl",
+                        help="formato das métricas: linhas JSON ou texto do Prometheus")
+    parser.add_argument("--metricas-intervalo", type=float, default=1.0,
+                        help="intervalo, em segundos, entre exportações das métricas")
+    parser.add_argument("--sem-grafico", action="store_true",
+                        help="não gera o diagrama de Gantt ao final (ver diagrama_Gantt.py para gerar depois)")
+    parser.add_argument("--debug", action="store_true",
+                        help="exibe o detalhe de cada mensagem e de cada clock (padrão: apenas o resumo)")
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
+
+    duracoes = []
+
+    for repeticao in range(args.repeticoes):
+        replay = REPLAY(args.arquivo_trace, args.algoritmo, args.buffer, timeline_format=args.formato, cpus=args.cpus,
+                        metricas=create_metrics(args.metricas, args.metricas_formato, args.metricas_intervalo))
+
+        # O gráfico só é gerado na última reprodução, fora da medição das demais
+        replay.gerar_grafico = not args.sem_grafico and repeticao == args.repeticoes - 1
+
+        inicio = time.perf_counter()
+        replay.start()
+        duracoes.append(time.perf_counter() - inicio)
+
+    logger.info("Reprodução concluída: %d mensagens, clock final %s, em %.3fs (melhor de %d)",
+                replay.mensagens_reproduzidas, replay.current_clock, min(duracoes), len(duracoes))
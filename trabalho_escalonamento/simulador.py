@@ -0,0 +1,125 @@
+from escalanador_de_tarefas import ESCALONADOR
+from metrics import METRICS_FORMATS, Metrics, NullMetrics, create_metrics
+from log_config import configure_logging
+from file_writer import TIMELINE_FORMATS
+from emissor_de_tarefas import open_task_source, task_to_dict
+from models import Thread
+import argparse
+import logging
+import time
+
+class SIMULADOR(ESCALONADOR):
+    '''
+        Simulação offline (evento discreto) do sistema de escalonamento.
+
+        Executa em um único processo o papel do CLOCK, do EMISSOR e do
+        ESCALONADOR, sem sockets e sem esperas: o tempo é virtual e avança
+        assim que o algoritmo termina de processar o clock atual.
+
+        Usa as mesmas classes de algoritmo e o mesmo FileWriter do escalonador,
+        produzindo arquivos de saída idênticos aos do sistema distribuído.
+    '''
+
+    def __init__(self, arquivo, algoritmo: str, buffer_size: int = 4096, flush_interval: float | None = None,
+                 timeline_format: str = "legado", cpus: int = 1, streaming: bool = False, ordenar: bool = False,
+                 metricas: Metrics | NullMetrics | None = None):
+        '''
+            *streaming* e *ordenar* selecionam a leitura do arquivo de tarefas
+            como no EMISSOR (sob demanda, com ordenação externa opcional).
+        '''
+
+        # Nenhuma porta é usada na simulação
+        super().__init__("localhost", None, None, None, algoritmo, buffer_size, flush_interval, timeline_format, cpus,
+                         metricas)
+
+        # Tarefas organizadas por tempo de ingresso, como no EMISSOR
+        self.tarefas_por_tempo = open_task_source(arquivo, streaming, ordenar)
+
+        # Clock virtual da simulação
+        self.virtual_clock = -1
+
+
+    def check_messages(self):
+        '''
+            Avança a simulação em um evento.
+
+            Chamado pelo loop do algoritmo sempre que ele terminou de processar
+            o clock atual. Reproduz a ordem de eventos do sistema distribuído:
+            1. O emissor entrega as tarefas com ingresso no próximo clock
+            2. O escalonador recebe o pulso desse clock
+            3. Após o processamento do clock em que as últimas tarefas foram
+               emitidas, o emissor sinaliza TAREFAS_FINALIZADAS
+        '''
+
+        if self.current_clock is not None and not self.emitter_completed and not self.tarefas_por_tempo:
+            self.emitter_completed = True
+            return
+
+        self.virtual_clock += 1
+        clock = str(self.virtual_clock)
+
+        self.receive_threads([Thread.from_dict(task_to_dict(tarefa)) for tarefa in self.tarefas_por_tempo.pop(clock, [])])
+
+        self.current_clock = clock
+
+
+    def create_server(self):
+        pass
+
+
+    def close_server(self):
+        pass
+
+
+    def confirm_tick(self):
+        pass
+
+
+    def communication_clock(self):
+        pass
+
+
+    def communication_emitter(self):
+        pass
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Simulação offline do escalonador de tarefas")
+    parser.add_argument("arquivo_tarefas",
+                        help="arquivo de entrada (id;tempo_ingresso;duracao_prevista;prioridade ou binário de binary_tasks.py)")
+    parser.add_argument("algoritmo", help="fcfs, rr, mlfq, cfs, sjf, srtf, prioc, priop ou priod")
+    parser.add_argument("--buffer", type=int, default=4096,
+                        help="entradas do timeline mantidas em memória antes de escrever no arquivo (0 = sem buffer)")
+    parser.add_argument("--formato", choices=TIMELINE_FORMATS, default="legado",
+                        help="formato do timeline no arquivo de saída")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="quantidade de núcleos simulados, cada um com sua fila de prontos")
+    parser.add_argument("--streaming", action="store_true",
+                        help="lê as tarefas sob demanda (arquivo ordenado por tempo de ingresso)")
+    parser.add_argument("--ordenar", action="store_true",
+                        help="ordena o arquivo por tempo de ingresso antes da leitura em streaming")
+    parser.add_argument("--metricas", default=None,
+                        help="arquivo para exportar as métricas de latência por fase")
+    parser.add_argument("--metricas-formato", choices=METRICS_FORMATS, default="jsonl",
+                        help="formato das métricas: linhas JSON ou texto do Prometheus")
+    parser.add_argument("--metricas-intervalo", type=float, default=1.0,
+                        help="intervalo, em segundos, entre exportações das métricas")
+    parser.add_argument("--sem-grafico", action="store_true",
+                        help="não gera o diagrama de Gantt ao final (ver diagrama_Gantt.py para gerar depois)")
+    parser.add_argument("--debug", action="store_true",
+                        help="exibe o detalhe de cada mensagem e de cada clock (padrão: apenas o resumo)")
+    args = parser.parse_args()
+
+    configure_logging(args.debug)
+
+    simulador = SIMULADOR(args.arquivo_tarefas, args.algoritmo, args.buffer, timeline_format=args.formato,
+                          cpus=args.cpus, streaming=args.streaming, ordenar=args.ordenar,
+                          metricas=create_metrics(args.metricas, args.metricas_formato, args.metricas_intervalo))
+    simulador.gerar_grafico = not args.sem_grafico
+
+    inicio = time.perf_counter()
+    simulador.start()
+    duracao = time.perf_counter() - inicio
+
+    logging.getLogger(__name__).info("Simulação concluída: %d clocks em %.3fs", simulador.virtual_clock + 1, duracao)
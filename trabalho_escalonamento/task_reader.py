@@ -0,0 +1,256 @@
+import heapq
+import logging
+import os
+import tempfile
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# Linhas ordenadas em memória por vez na ordenação externa
+LINHAS_POR_BLOCO = 1_000_000
+
+
+class SortedTaskReader:
+    '''
+        Leitura em streaming de um arquivo de tarefas ordenado por tempo de ingresso.
+
+        Em vez de carregar o arquivo inteiro (ver load_tasks_by_time), lê
+        apenas o lote de tarefas do próximo tempo de ingresso, à medida que
+        o clock avança. A memória fica limitada ao maior lote de um mesmo
+        clock, independentemente do tamanho do arquivo.
+
+        Oferece o subconjunto da interface do dicionário {tempo_ingresso: [dados_tarefa, ...]}
+        usado pelo EMISSOR e pelo simulador (get, pop, del, in e bool), com o
+        tempo como string, como o valor de clock recebido. Os clocks devem ser
+        consultados em ordem crescente.
+
+        Um arquivo fora de ordem gera ValueError na leitura; nesse caso, use
+        external_sort() antes (opção --ordenar).
+    '''
+
+    def __init__(self, task_file, remover_ao_fechar: bool = False):
+        '''
+            *task_file*: arquivo de tarefas (id;tempo_ingresso;duracao_prevista;prioridade)
+            *remover_ao_fechar* (bool): apaga o arquivo ao terminar a leitura
+            (usado para o arquivo temporário gerado pela ordenação externa)
+        '''
+
+        self.task_file = task_file
+        self._arquivo = open(task_file, 'r')
+        self._remover_ao_fechar = remover_ao_fechar
+        self._linha_num = 0
+
+        # Lote carregado (tempo de ingresso e tarefas) e a primeira linha do lote seguinte
+        self._lote_tempo = None
+        self._lote = None
+        self._pendente = None
+
+
+    def _proxima_linha(self):
+        '''
+            Retorna os dados da próxima linha válida, ou None no fim do arquivo.
+        '''
+
+        if self._arquivo is None:
+            return None
+
+        for linha in self._arquivo:
+            self._linha_num += 1
+            linha = linha.strip()
+
+            if not linha:  # Ignora linhas vazias
+                continue
+
+            dados_tarefa = linha.split(';')
+
+            if len(dados_tarefa) != 4:
+                logger.warning("Aviso: Linha %d com formato inválido: %s", self._linha_num, linha)
+                continue
+
+            return dados_tarefa
+
+        self.close()
+        return None
+
+
+    def _carregar_lote(self):
+        '''
+            Lê o próximo lote (todas as tarefas com o mesmo tempo de ingresso),
+            se nenhum estiver carregado.
+        '''
+
+        if self._lote is not None:
+            return
+
+        dados_tarefa = self._pendente if self._pendente is not None else self._proxima_linha()
+        self._pendente = None
+
+        if dados_tarefa is None:
+            return
+
+        tempo = int(dados_tarefa[1])
+        lote = [dados_tarefa]
+
+        while (dados_tarefa := self._proxima_linha()) is not None:
+            tempo_tarefa = int(dados_tarefa[1])
+
+            if tempo_tarefa != tempo:
+                if tempo_tarefa < tempo:
+                    raise ValueError(f"Arquivo {self.task_file} não está ordenado por tempo de ingresso "
+                                     f"(linha {self._linha_num}); use a ordenação externa")
+
+                self._pendente = dados_tarefa
+                break
+
+            lote.append(dados_tarefa)
+
+        self._lote_tempo = tempo
+        self._lote = lote
+
+
+    def get(self, clock, default=None):
+        '''
+            Retorna as tarefas com ingresso em *clock*, sem consumi-las.
+        '''
+
+        self._carregar_lote()
+
+        if self._lote is not None and self._lote_tempo == int(clock):
+            return self._lote
+
+        return default
+
+
+    def pop(self, clock, default=None):
+        '''
+            Retorna e consome as tarefas com ingresso em *clock*.
+        '''
+
+        lote = self.get(clock)
+
+        if lote is None:
+            return default
+
+        self._lote = None
+        return lote
+
+
+    def batches(self):
+        '''
+            Percorre e consome os lotes restantes, em ordem: (tempo_ingresso, tarefas).
+        '''
+
+        while self:
+            tempo, lote = self._lote_tempo, self._lote
+            self._lote = None
+            yield tempo, lote
+
+
+    def __contains__(self, clock):
+        return self.get(clock) is not None
+
+
+    def __delitem__(self, clock):
+        if self.pop(clock) is None:
+            raise KeyError(clock)
+
+
+    def __bool__(self):
+        '''
+            Indica se ainda há tarefas a emitir.
+        '''
+
+        self._carregar_lote()
+        return self._lote is not None
+
+
+    def close(self):
+        '''
+            Fecha o arquivo (e o apaga, se for temporário).
+        '''
+
+        if self._arquivo is None:
+            return
+
+        self._arquivo.close()
+        self._arquivo = None
+
+        if self._remover_ao_fechar:
+            os.remove(self.task_file)
+
+
+def _tempo_ingresso(linha: str) -> int:
+    '''
+        Chave de ordenação de uma linha do arquivo de tarefas.
+
+        Linhas inválidas vão para o início; a leitura as descarta com aviso.
+    '''
+
+    try:
+        return int(linha.split(';', 2)[1])
+    except (IndexError, ValueError):
+        return -1
+
+
+def external_sort(task_file, saida=None, linhas_por_bloco: int = LINHAS_POR_BLOCO, chave=_tempo_ingresso) -> str:
+    '''
+        Ordena um arquivo de tarefas por tempo de ingresso com memória limitada.
+
+        *chave* (callable) define a ordenação de cada linha; por padrão, o
+        tempo de ingresso. Também é usada para as linhas de estatísticas do
+        FileWriter (ordenadas por ID).
+
+        O arquivo é lido em blocos de *linhas_por_bloco* linhas; cada bloco é
+        ordenado em memória e gravado em um arquivo temporário, e os blocos
+        são intercalados (heapq.merge) no arquivo *saida*. A ordenação é
+        estável: tarefas com o mesmo tempo de ingresso mantêm a ordem do
+        arquivo original, como em load_tasks_by_time.
+
+        Sem *saida*, grava em um arquivo temporário. Retorna o caminho do
+        arquivo ordenado.
+    '''
+
+    blocos = []
+
+    try:
+        with open(task_file, 'r') as arq:
+            while True:
+                linhas = list(islice(arq, linhas_por_bloco))
+
+                if not linhas:
+                    break
+
+                linhas = [linha if linha.endswith('\n') else linha + '\n' for linha in linhas if linha.strip()]
+                linhas.sort(key=chave)
+
+                bloco = tempfile.TemporaryFile('w+')
+                bloco.writelines(linhas)
+                bloco.seek(0)
+                blocos.append(bloco)
+
+        if saida is None:
+            descritor, saida = tempfile.mkstemp(prefix="tarefas_ordenadas_", suffix=".txt")
+            os.close(descritor)
+
+        with open(saida, 'w') as destino:
+            destino.writelines(heapq.merge(*blocos, key=chave))
+
+    finally:
+        for bloco in blocos:
+            bloco.close()
+
+    return saida
+
+
+def open_task_stream(task_file, ordenar: bool = False, linhas_por_bloco: int = LINHAS_POR_BLOCO) -> SortedTaskReader:
+    '''
+        Abre um arquivo de tarefas para leitura em streaming.
+
+        Com *ordenar*, aplica antes a ordenação externa em um arquivo
+        temporário, removido ao fim da leitura.
+    '''
+
+    if ordenar:
+        return SortedTaskReader(external_sort(task_file, linhas_por_bloco=linhas_por_bloco), remover_ao_fechar=True)
+
+    return SortedTaskReader(task_file)
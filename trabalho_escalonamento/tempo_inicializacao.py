@@ -0,0 +1,85 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Processos da simulação em rede cuja inicialização é verificada
+MODULOS = ("escalanador_de_tarefas", "clock", "emissor_de_tarefas")
+
+# Tempo máximo de importação de cada módulo, em milissegundos
+ORCAMENTO_MS = 150
+
+# Módulos que não podem ser carregados na inicialização (só ao gerar gráficos)
+PROIBIDOS = ("matplotlib", "numpy")
+
+
+def medir_importacao(modulo: str) -> dict[str, int]:
+    '''
+        Importa *modulo* em um interpretador novo com -X importtime.
+
+        Retorna o tempo cumulativo, em microssegundos, de cada módulo
+        carregado durante a importação (incluindo o próprio *modulo*).
+    '''
+
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+    tempos = {}
+
+    # Formato das linhas: "import time: <próprio> | <cumulativo> | <módulo>"
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        if cumulativo.strip().isdigit():
+            tempos[nome.strip()] = int(cumulativo)
+
+    return tempos
+
+
+def verificar(modulos=MODULOS, orcamento_ms: float = ORCAMENTO_MS, repeticoes: int = 5, detalhes: int = 5) -> bool:
+    '''
+        Verifica o orçamento de inicialização de cada módulo.
+
+        Cada módulo é medido *repeticoes* vezes e vale a menor medição
+        (a menos afetada por ruído). Imprime o tempo de cada módulo e as
+        *detalhes* importações mais caras. Retorna False se algum módulo
+        exceder *orcamento_ms* ou carregar um módulo de PROIBIDOS.
+    '''
+
+    aprovado = True
+
+    for modulo in modulos:
+        tempos = min((medir_importacao(modulo) for _ in range(repeticoes)), key=lambda t: t[modulo])
+        total_ms = tempos[modulo] / 1000
+        proibidos = sorted(nome for nome in tempos if nome.split(".")[0] in PROIBIDOS)
+
+        situacao = "OK" if total_ms <= orcamento_ms and not proibidos else "FALHOU"
+        aprovado = aprovado and situacao == "OK"
+        print(f"{modulo:<24} {total_ms:>8.1f} ms  (orçamento {orcamento_ms:.0f} ms)  {situacao}")
+
+        if proibidos:
+            print(f"    carrega módulos proibidos na inicialização: {', '.join(proibidos)}")
+
+        mais_caros = sorted((nome for nome in tempos if nome != modulo), key=tempos.get, reverse=True)
+        for nome in mais_caros[:detalhes]:
+            print(f"    {nome:<40} {tempos[nome] / 1000:>8.1f} ms")
+
+    return aprovado
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Verifica o tempo de inicialização (importação) dos processos")
+    parser.add_argument("modulos", nargs="*", default=list(MODULOS),
+                        help="módulos verificados (padrão: escalonador, clock e emissor)")
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_MS,
+                        help="tempo máximo de importação de cada módulo, em milissegundos")
+    parser.add_argument("--repeticoes", type=int, default=5,
+                        help="medições por módulo (vale a menor)")
+    parser.add_argument("--detalhes", type=int, default=5,
+                        help="importações mais caras exibidas por módulo")
+    args = parser.parse_args()
+
+    sys.exit(0 if verificar(args.modulos, args.orcamento, args.repeticoes, args.detalhes) else 1)